@@ -9,76 +9,109 @@ import dash.exceptions
 
 from components.top_bar import top_bar
 from components.login_modal import login_modal
-from pages.dashview import dashboard_page
-from pages.transactions import transactions_page, transaction_form, register_callbacks
-from pages.admin import admin_page
-from pages.profile import profile_page
-from utils.users import USERS
+# Page modules keep heavy libraries (pandas, plotly.express) inside their
+# render functions, so registering callbacks here stays cheap; admin and
+# profile pages are imported on the first visit to their route.
+from pages.dashview import register_callbacks as register_dashboard_callbacks
+from pages.drilldown import register_callbacks as register_drilldown_callbacks
+from pages.metrics import register_callbacks as register_metrics_callbacks
+from pages.transactions import register_callbacks
+from utils.db import init_db
+from utils.users import authenticate, get_user, set_password, set_role
+from utils.export import register_export_route
+from utils.sessions import create_session, delete_session, get_session_user
+from utils import instrumentation, worker
 
 
 app = dash.Dash(__name__, suppress_callback_exceptions=True)
 app.title = 'TeamPower Finance Dashboard'
+server = app.server
 register_callbacks(app)
+register_dashboard_callbacks(app)
+register_drilldown_callbacks(app)
+register_metrics_callbacks(app)
+register_export_route(app.server)
+# Times every callback, route and utils.db query; see /admin/metrics and /metrics
+instrumentation.install(app)
 
-# --- Store login state ---
-app._user = None
-app._show_login = False
-app._login_error = None
+# --- Startup hook ---
+def startup(background=True):
+    """Bring the database schema up to date and, with `background`, start the
+    cache-warming thread. Call once per process before serving (python app.py
+    and wsgi.py do); importing app has no side effects."""
+    init_db()
+    if background:
+        worker.start()
 
+# --- Login state ---
+# The browser tab holds an opaque session token; callbacks resolve the user
+# from it via utils.sessions, so nothing user-specific lives on the app.
 app.layout = html.Div([
     dcc.Location(id='url', refresh=False),
+    dcc.Store(id='session-token', storage_type='session'),
     html.Div(top_bar(), id='top-bar'),
     html.Div(id='page-content'),
-    html.Div(login_modal(False), id='login-modal-container'),
-    dcc.Download(id='download-dataframe-csv')
+    html.Div(login_modal(False), id='login-modal-container')
 ])
 
 # --- Top Bar and Login Modal Callback ---
 @app.callback(
     Output('top-bar', 'children'),
     Output('login-modal-container', 'children'),
+    Output('session-token', 'data'),
     Input('user-icon', 'n_clicks'),
     Input('login-btn', 'n_clicks'),
     Input('cancel-login-btn', 'n_clicks'),
     Input('url', 'pathname'),
     State('login-username', 'value'),
     State('login-password', 'value'),
+    State('session-token', 'data'),
 )
-def handle_login(user_icon_click=None, login_click=None, cancel_click=None, pathname=None, username=None, password=None):
+def handle_login(user_icon_click=None, login_click=None, cancel_click=None, pathname=None, username=None, password=None, token=None):
     trigger = ctx.triggered_id if ctx.triggered_id else None
+    current_user = get_session_user(token)
+    new_token = dash.no_update
+    show_login = False
+    login_error = None
     # Always allow login modal to open
     if trigger == 'user-icon':
-        app._show_login = True
-        app._login_error = None
+        show_login = True
     elif trigger == 'login-btn':
-        user = USERS.get(username)
-        if user and user['password'] == password:
-            app._user = username
-            app._show_login = False
-            app._login_error = None
+        if authenticate(username, password):
+            delete_session(token)
+            new_token = create_session(username)
+            current_user = username
         else:
-            app._login_error = 'Invalid credentials.'
-            app._show_login = True
-    elif trigger == 'cancel-login-btn':
-        app._show_login = False
-        app._login_error = None
-    return top_bar(app._user), login_modal(app._show_login, app._login_error)
+            login_error = 'Invalid credentials.'
+            show_login = True
+    return top_bar(current_user), login_modal(show_login, login_error), new_token
 
 # --- Unified Page Content Callback ---
 @app.callback(
     Output('page-content', 'children'),
     Input('url', 'pathname'),
+    Input('session-token', 'data'),
 )
-def display_page(pathname):
-    user = app._user
+def display_page(pathname, token):
+    user = get_session_user(token)
     # Handle routing
     if pathname == '/profile':
+        from pages.profile import profile_page
         return profile_page(user)
+    elif pathname == '/admin/metrics':
+        from pages.metrics import metrics_page
+        return metrics_page(user)
     elif pathname == '/admin':
+        from pages.admin import admin_page
         return admin_page(user)
     elif pathname == '/transactions':
+        from pages.transactions import transactions_page
         return transactions_page()
+    elif pathname == '/drilldown':
+        from pages.drilldown import drilldown_page
+        return drilldown_page()
     else:
+        from pages.dashview import dashboard_page
         return dashboard_page()
 
 # --- Admin Access Change Callback ---
@@ -86,13 +119,17 @@ def display_page(pathname):
     Output('admin-msg', 'children'),
     Input({'type':'access-dropdown','index':ALL}, 'value'),
     State({'type':'access-dropdown','index':ALL}, 'id'),
+    State('session-token', 'data'),
 )
-def update_access(values, ids):
+def update_access(values, ids, token):
     msg = ''
+    if get_session_user(token) != 'admin':
+        return msg
     for v, i in zip(values, ids):
         uname = i['index']
-        if uname in USERS:
-            USERS[uname]['role'] = v
+        user = get_user(uname)
+        # Roles live in the database, so the change reaches every worker
+        if user and user['role'] != v and set_role(uname, v):
             msg += f"Updated {uname} to {v}. "
     return msg
 
@@ -101,27 +138,15 @@ def update_access(values, ids):
     Output('profile-msg', 'children'),
     Input('update-password-btn', 'n_clicks'),
     State('new-password', 'value'),
+    State('session-token', 'data'),
 )
-def update_password(n_clicks, new_password):
+def update_password(n_clicks, new_password, token):
     if n_clicks and new_password:
-        if app._user and app._user in USERS:
-            USERS[app._user]['password'] = new_password
+        user = get_session_user(token)
+        if user and set_password(user, new_password):
             return 'Password updated!'
     return ''
 
-# --- CSV Download Callbacks ---
-@app.callback(
-    Output('download-dataframe-csv', 'data'),
-    Input('download-button', 'n_clicks'),
-    Input('url', 'pathname'),
-    prevent_initial_call=True
-)
-def download_csv(n_clicks, pathname):
-    if pathname == '/transactions' and n_clicks:
-        from utils.db import get_transactions_df
-        df = get_transactions_df()
-        return dcc.send_data_frame(df.to_csv, 'transactions.csv', index=False)
-    return None
-
 if __name__ == '__main__':
+    startup()
     app.run(debug=False, port=8051)
@@ -0,0 +1,64 @@
+"""Benchmark the dashboard aggregation engine against the per-category loop
+it replaced, on synthetic ledgers of increasing size.
+
+    python -m benchmarks.bench_engine [--rows 100000 1000000 3000000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.db import CATEGORIES, TYPES
+from utils.engine import build_matrices
+
+YEAR_START = pd.Timestamp('2025-01-01')
+YEAR_END = pd.Timestamp('2025-12-31')
+
+def synthetic_frame(rows, seed=42):
+    rng = np.random.default_rng(seed)
+    days = pd.date_range(YEAR_START, YEAR_END, freq='D').to_numpy()
+    return pd.DataFrame({
+        'Date': rng.choice(days, rows),
+        'Category': rng.choice(CATEGORIES, rows),
+        'Type': rng.choice(TYPES, rows),
+        'Amount': rng.integers(100, 1_000_000, rows) / 100.0,
+    })
+
+def legacy_matrices(df, start, end):
+    """The loop dashboard_page used before the engine, kept for comparison."""
+    date_range = pd.date_range(start=start, end=end, freq='D')
+    ytd_data = []
+    for category in CATEGORIES:
+        cat_data = df[df['Category'] == category].copy()
+        if not cat_data.empty:
+            daily_sums = cat_data.groupby('Date')['Amount'].sum()
+            cumsum = daily_sums.reindex(date_range, fill_value=0).cumsum()
+            ytd_data.append(pd.DataFrame({category: cumsum}))
+    ytd = pd.concat(ytd_data, axis=1).ffill().fillna(0)
+    monthly = df.groupby([df['Date'].dt.strftime('%Y-%m'), 'Type'])['Amount'].sum().unstack(fill_value=0)
+    return ytd, monthly
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000, 3_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>12} {'engine (s)':>12} {'legacy (s)':>12} {'speedup':>8}")
+    for rows in args.rows:
+        df = synthetic_frame(rows)
+        engine = best_of(lambda: build_matrices(df, YEAR_START, YEAR_END), args.repeat)
+        legacy = best_of(lambda: legacy_matrices(df, YEAR_START, YEAR_END), args.repeat)
+        print(f'{rows:>12,} {engine:>12.4f} {legacy:>12.4f} {legacy / engine:>7.1f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark how the parallel report engine scales with worker processes on
+synthetic ledgers, for both partitionings.
+
+    python -m benchmarks.bench_reports [--rows 1000000] [--workers 1 2 4 8]
+
+Each ledger is generated into a scratch database by utils.data. The pool is
+started before timing, so the figures exclude process start-up, and every
+report is checked against the single-process one. The last line per size
+times build_ledger_report() on a warm ledger snapshot, for reference.
+"""
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.bench_engine import best_of
+from utils import data, db, reports
+
+def same_report(left, right):
+    keys = [*reports.GROUP_KEYS, 'Month']
+    values = [column for column in reports.REPORT_COLUMNS if column not in keys]
+    return (left[keys].equals(right[keys])
+            and np.allclose(left[values].to_numpy(float), right[values].to_numpy(float)))
+
+def main(argv=None):
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, *(n for n in (2, 4, 8, 16) if n <= cores), cores}))
+    parser.add_argument('--cost-centers', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f'{cores} CPU cores')
+    print(f"{'rows':>12} {'workers':>8} " + ' '.join(f'{by + " (s)":>16} {"speedup":>8}' for by in reports.PARTITION_BY))
+    with tempfile.TemporaryDirectory() as scratch:
+        for rows in args.rows:
+            db.DB_PATH = Path(scratch) / f'reports_{rows}.db'
+            data.populate_db(rows, years=[2023, 2024, 2025], cost_centers=args.cost_centers, skew=0.5)
+            baseline = {by: reports.build_report(by, workers=1) for by in reports.PARTITION_BY}
+            serial = {}
+            for workers in args.workers:
+                cells = []
+                for by in reports.PARTITION_BY:
+                    if not same_report(reports.build_report(by, workers=workers), baseline[by]):
+                        raise SystemExit(f'{by} report with {workers} workers differs from the serial one')
+                    seconds = best_of(lambda: reports.build_report(by, workers=workers), args.repeat)
+                    serial.setdefault(by, seconds)
+                    cells.append(f'{seconds:>16.3f} {serial[by] / seconds:>7.2f}x')
+                print(f'{rows:>12,} {workers:>8} ' + ' '.join(cells))
+            if not same_report(reports.build_ledger_report(), baseline[reports.PARTITION_BY[0]]):
+                raise SystemExit('report from the ledger snapshot differs from the serial one')
+            seconds = best_of(reports.build_ledger_report, args.repeat)
+            print(f"{rows:>12,} {'ledger':>8} {seconds:>16.3f}")
+    reports.shutdown_pool()
+
+if __name__ == '__main__':
+    main()
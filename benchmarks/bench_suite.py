@@ -0,0 +1,136 @@
+"""Time the main read and write paths on synthetic ledgers of increasing size
+and emit a JSON report that can be diffed across versions.
+
+    python -m benchmarks.bench_suite [--rows 1000 100000 1000000] [--output report.json]
+
+Each size runs in its own subprocess against a scratch database (via
+TEAMPOWER_DB) populated by utils.data, so caches and connections start cold
+and the real team_power.db is never touched.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from benchmarks.bench_engine import best_of
+
+def run_size(rows, repeat, inserts):
+    """Populate the scratch database and time each operation; runs in the worker."""
+    from utils import data
+    from utils.cache import aggregate_cache, figure_cache
+    from utils.db import add_transaction, get_connection, get_transactions_df
+    from utils.export import iter_csv
+    from utils.ledger import get_ledger
+    from pages.dashview import (dashboard_aggregates, dashboard_figures, dashboard_page, default_fiscal_year,
+                                summary_page)
+    from pages.transactions import transactions_page
+    from utils.periods import resolve_period
+
+    started = time.perf_counter()
+    data.populate_db(rows, years=[2024, 2025])
+    results = {'populate_s': time.perf_counter() - started}
+
+    start, end, _ = resolve_period('fiscal_year', default_fiscal_year())
+
+    def dashboard_panels():
+        dashboard_aggregates(start, end)
+        dashboard_figures(start, end)
+        summary_page('transactions', start, end)
+        summary_page('cost_center', start, end)
+
+    def cold_dashboard_panels():
+        aggregate_cache.clear()
+        figure_cache.clear()
+        dashboard_panels()
+
+    def export_csv():
+        for _ in iter_csv():
+            pass
+
+    results['get_transactions_df_s'] = best_of(get_transactions_df, repeat)
+    results['get_transactions_df_projected_s'] = best_of(
+        lambda: get_transactions_df(['Date', 'Amount', 'Category']), repeat)
+    started = time.perf_counter()
+    get_ledger()
+    results['ledger_snapshot_cold_s'] = time.perf_counter() - started
+    results['ledger_snapshot_warm_s'] = best_of(get_ledger, repeat)
+    results['dashboard_page_s'] = best_of(dashboard_page, repeat)
+    # The page is a skeleton since its panels became callbacks; time their data too
+    results['dashboard_panels_cold_s'] = best_of(cold_dashboard_panels, repeat)
+    results['dashboard_panels_warm_s'] = best_of(dashboard_panels, repeat)
+    results['transactions_page_s'] = best_of(transactions_page, repeat)
+    results['export_csv_s'] = best_of(export_csv, repeat)
+
+    started = time.perf_counter()
+    for _ in range(inserts):
+        add_transaction('2025-06-30', 'CCP1', 'CCS1', '1000', '2000', 123.45, 'Consumed', 'OPEX')
+    results['add_transaction_s'] = (time.perf_counter() - started) / inserts
+    # Only the rows added above are fetched and appended
+    started = time.perf_counter()
+    get_ledger()
+    results['ledger_snapshot_delta_s'] = time.perf_counter() - started
+    # An edit or delete, however it was made, must reload the snapshot in full
+    conn = get_connection()
+    edited, deleted = conn.execute('SELECT id FROM transactions ORDER BY id LIMIT 2').fetchall()
+    with conn:
+        conn.execute('UPDATE transactions SET amount_cents = -150 WHERE id = ?', edited)
+        conn.execute('DELETE FROM transactions WHERE id = ?', deleted)
+    started = time.perf_counter()
+    frame = get_ledger().frame
+    results['ledger_snapshot_edit_s'] = time.perf_counter() - started
+    if frame.loc[frame['id'] == edited[0], 'Amount'].tolist() != [-1.5] or (frame['id'] == deleted[0]).any():
+        raise SystemExit('ledger snapshot was not reloaded after an UPDATE and a DELETE')
+    return results
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--inserts', type=int, default=50, help='single add_transaction calls to average')
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker is not None:
+        print(json.dumps(run_size(args.worker, args.repeat, args.inserts)))
+        return
+
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': {},
+    }
+    with tempfile.TemporaryDirectory() as scratch:
+        for rows in args.rows:
+            env = dict(os.environ, TEAMPOWER_DB=os.path.join(scratch, f'bench_{rows}.db'))
+            worker = subprocess.run([sys.executable, '-m', 'benchmarks.bench_suite', '--worker', str(rows),
+                                     '--repeat', str(args.repeat), '--inserts', str(args.inserts)],
+                                    env=env, capture_output=True, text=True)
+            if worker.returncode:
+                sys.exit(f'{rows:,} rows failed:\n{worker.stderr}')
+            report['results'][str(rows)] = json.loads(worker.stdout)
+            print(f'{rows:>12,} rows done', file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+if __name__ == '__main__':
+    main()
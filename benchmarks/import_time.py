@@ -0,0 +1,63 @@
+"""Cold-start budget check for ``import app``.
+
+Runs ``python -X importtime -c "import app"`` in fresh interpreters and exits
+non-zero if the best cumulative import time exceeds the budget, or if any
+module that should load lazily on first use of a route is imported eagerly.
+
+    python -m benchmarks.import_time [--budget-ms 1500] [--runs 3]
+"""
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Heavy libraries and pages that must not load until a route needs them
+LAZY_MODULES = ['pandas', 'numpy', 'plotly.express', 'utils.engine', 'utils.forecast', 'pages.admin', 'pages.profile']
+
+DEFAULT_BUDGET_MS = 1500
+
+_LINE_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$')
+
+def measure(module='app'):
+    """Return ({module name: cumulative microseconds}, top-level cumulative microseconds)."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(f'import {module} failed:\n{result.stderr[-2000:]}')
+    imported = {}
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            imported[match.group(4)] = int(match.group(2))
+    return imported, imported.get(module, 0)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fail if importing app gets slower or less lazy.')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument('--runs', type=int, default=3, help='best of N fresh interpreters')
+    parser.add_argument('--top', type=int, default=10, help='slowest modules to list')
+    args = parser.parse_args(argv)
+
+    runs = [measure() for _ in range(args.runs)]
+    imported, best = min(runs, key=lambda run: run[1])
+    best_ms = best / 1000
+
+    print(f'import app: {best_ms:.0f} ms (budget {args.budget_ms:.0f} ms, best of {args.runs})')
+    for name, micros in sorted(imported.items(), key=lambda item: -item[1])[1:args.top + 1]:
+        print(f'  {micros / 1000:8.1f} ms  {name}')
+
+    failures = []
+    eager = [name for name in LAZY_MODULES if name in imported]
+    if eager:
+        failures.append(f"imported eagerly: {', '.join(eager)}")
+    if best_ms > args.budget_ms:
+        failures.append(f'{best_ms:.0f} ms exceeds the {args.budget_ms:.0f} ms budget')
+    for failure in failures:
+        print(f'FAIL: {failure}', file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,7 +3,8 @@ from dash import dcc, html
 def top_bar(username=None):
     links = [
         dcc.Link('Dashboard', href='/', style={'color':'white','marginRight':'20px'}),
-        dcc.Link('Transactions', href='/transactions', style={'color':'white','marginRight':'20px'})
+        dcc.Link('Transactions', href='/transactions', style={'color':'white','marginRight':'20px'}),
+        dcc.Link('Drill-down', href='/drilldown', style={'color':'white','marginRight':'20px'})
     ]
     if username:
         links.append(dcc.Link('Profile', href='/profile', style={'color':'white'}))
@@ -0,0 +1,30 @@
+"""Gunicorn settings for serving wsgi:server. Override with environment variables:
+
+    TEAMPOWER_BIND     address to listen on            (default 0.0.0.0:8051)
+    TEAMPOWER_WORKERS  worker processes                (default min(2 * CPUs, 8))
+    TEAMPOWER_THREADS  threads per worker (gthread)    (default 4)
+    TEAMPOWER_PRELOAD  import the app before forking   (default 1)
+    TEAMPOWER_TIMEOUT  worker timeout in seconds       (default 60)
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('TEAMPOWER_BIND', '0.0.0.0:8051')
+workers = int(os.environ.get('TEAMPOWER_WORKERS', min(2 * multiprocessing.cpu_count(), 8)))
+threads = int(os.environ.get('TEAMPOWER_THREADS', 4))
+worker_class = 'gthread' if threads > 1 else 'sync'
+preload_app = os.environ.get('TEAMPOWER_PRELOAD', '1') not in ('0', 'false', 'no')
+timeout = int(os.environ.get('TEAMPOWER_TIMEOUT', 60))
+accesslog = '-'
+
+def pre_fork(server, worker):
+    # Never hand the master's SQLite connection to a forked worker
+    from utils.db import close_connection
+    close_connection()
+
+def post_fork(server, worker):
+    from utils.db import check_wal_mode
+    from utils.worker import start
+    check_wal_mode()
+    # Each worker keeps its own in-process caches warm
+    start()
@@ -1,7 +1,22 @@
 # Initialize the pages package
-from .dashview import dashboard_page
-from .transactions import transactions_page, transaction_form, register_callbacks
-from .admin import admin_page
-from .profile import profile_page
+# Page modules are imported on first attribute access (PEP 562) so importing
+# one page does not pull in every other page and its dependencies.
+import importlib
 
-__all__ = ['dashboard_page', 'transactions_page', 'transaction_form', 'register_callbacks', 'admin_page', 'profile_page']
+_EXPORTS = {
+    'dashboard_page': '.dashview',
+    'transactions_page': '.transactions',
+    'transaction_form': '.transactions',
+    'register_callbacks': '.transactions',
+    'drilldown_page': '.drilldown',
+    'admin_page': '.admin',
+    'metrics_page': '.metrics',
+    'profile_page': '.profile',
+}
+
+__all__ = ['dashboard_page', 'transactions_page', 'transaction_form', 'register_callbacks', 'drilldown_page', 'admin_page', 'metrics_page', 'profile_page']
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
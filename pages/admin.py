@@ -1,5 +1,5 @@
 from dash import dcc, html
-from utils.users import USERS
+from utils.users import list_users
 
 def admin_page(current_user):
     if current_user != 'admin':
@@ -8,7 +8,8 @@ def admin_page(current_user):
             html.P('Access denied. Only admin can manage users.')
         ])
     user_rows = []
-    for uname, info in USERS.items():
+    for info in list_users():
+        uname = info['username']
         user_rows.append(html.Tr([
             html.Td(uname),
             html.Td(info['role']),
@@ -28,5 +29,6 @@ def admin_page(current_user):
             html.Thead(html.Tr([html.Th('Username'),html.Th('Access'),html.Th('Set Access')])),
             html.Tbody(user_rows)
         ], style={'width':'100%','borderCollapse':'collapse'}),
-        html.Div(id='admin-msg', style={'color':'green','marginTop':'10px'})
+        html.Div(id='admin-msg', style={'color':'green','marginTop':'10px'}),
+        dcc.Link('Callback and query metrics', href='/admin/metrics', style={'display':'block','marginTop':'20px'})
     ])
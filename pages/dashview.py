@@ -1,338 +1,385 @@
-import dash
 from dash import dcc, html, dash_table
-import plotly.express as px
-import pandas as pd
-from utils.db import get_transactions_df
-from dash.dependencies import Input, Output
+import json
+from datetime import date
+from utils.db import (get_category_totals, get_daily_summary, get_date_bounds, get_data_version,
+                      DISPLAY_COLUMNS, SUMMARY_GROUPS, query_transactions, count_transactions,
+                      query_group_totals, count_groups, group_total_columns)
+from dash import Patch, no_update
+from dash.dependencies import Input, Output, State
+from utils.export import export_url
+from utils.filters import filter_query_to_sql, sort_by_to_sql
+from utils.cache import aggregate_cache, figure_cache, cached_by_data_version
+from utils.worker import remember_period
+from utils.periods import (PERIOD_KINDS, fiscal_year_of, fiscal_year_options, month_tick_labels,
+                           quarter_groups, resolve_period)
 
-def dashboard_page():
-    """Main dashboard page function that renders the dashboard layout"""
-    # Color scheme
-    colors = {
-        'Budget': '#2E86C1',      # Strong blue
-        'Planned': '#F1C40F',     # Warm yellow
-        'Consumed': '#E74C3C',    # Bright red
-        'OPEX': '#27AE60',        # Rich green
-        'CAPEX': '#8E44AD',       # Deep purple
-        'background': '#F8F9F9',  # Light gray
-        'text': '#2C3E50'         # Dark blue-gray
-    }
-    
-    df = get_transactions_df()
-    # Ensure all expected columns exist
-    expected_cols = ['Date','Cost Center Project','Cost Center SOW','SOW Number','PO','Amount','Category','Type']
-    for col in expected_cols:
-        if col not in df.columns:
-            df[col] = None
-    
-    # Convert Date to datetime
-    df['Date'] = pd.to_datetime(df['Date'])
-    
-    # Create full year date range
-    year_start = pd.Timestamp('2025-01-01')
-    year_end = pd.Timestamp('2025-12-31')
+# How often an open dashboard checks for new transactions
+DASHBOARD_POLL_MS = 30 * 1000
+
+SUMMARY_PAGE_SIZE = 10
+
+SUMMARY_VIEWS = [
+    {'label': 'Transactions', 'value': 'transactions'},
+    {'label': 'By cost center', 'value': 'cost_center'},
+    {'label': 'By month', 'value': 'month'},
+]
+
+# Color scheme
+COLORS = {
+    'Budget': '#2E86C1',      # Strong blue
+    'Planned': '#F1C40F',     # Warm yellow
+    'Consumed': '#E74C3C',    # Bright red
+    'OPEX': '#27AE60',        # Rich green
+    'CAPEX': '#8E44AD',       # Deep purple
+    'background': '#F8F9F9',  # Light gray
+    'text': '#2C3E50'         # Dark blue-gray
+}
+
+@cached_by_data_version(aggregate_cache)
+def dashboard_aggregates(start, end):
+    """KPI totals, cumulative series and monthly OPEX/CAPEX split for [start, end].
+
+    Every query is bounded by the period, so multi-year ledgers only scan the
+    requested window. Cached per data version, so repeated dashboard views
+    between writes skip both the SQL and the pandas work. Callers must not
+    mutate the results."""
+    # pandas and the engine load on the first dashboard render, not at startup
+    import pandas as pd
+    from utils.engine import build_matrices
     
-    total_budget = df[df['Category']=='Budget']['Amount'].sum() if not df.empty else 0
-    total_planned = df[df['Category']=='Planned']['Amount'].sum() if not df.empty else 0
-    total_consumed = df[df['Category']=='Consumed']['Amount'].sum() if not df.empty else 0
-    funding_gap = total_consumed - total_budget
+    totals = get_category_totals(start, end)
     
-    if not df.empty:
-        # Create full year date range with all dates
-        date_range = pd.date_range(start=year_start, end=year_end, freq='D')
-        
-        # Create cumulative sums for each category
-        categories = ['Budget', 'Planned', 'Consumed']
-        ytd_data = []
-        
-        for category in categories:
-            cat_data = df[df['Category'] == category].copy()
-            if not cat_data.empty:
-                daily_sums = cat_data.groupby('Date')['Amount'].sum()
-                cumsum = daily_sums.reindex(date_range, fill_value=0).cumsum()
-                ytd_data.append(pd.DataFrame({category: cumsum}))
-        
-        ytd = pd.concat(ytd_data, axis=1).fillna(method='ffill').fillna(0)
-        
-        # Create full year monthly range including December
-        all_months = pd.date_range(start=year_start, end=pd.Timestamp('2025-12-01'), freq='MS')
-        
-        # Monthly aggregation by type with all months
-        monthly_data = df.groupby([df['Date'].dt.strftime('%Y-%m'), 'Type'])['Amount'].sum().unstack(fill_value=0)
-        
-        # Reindex to include all months with proper month names
-        month_index = [d.strftime('%Y-%m') for d in all_months]
-        monthly = pd.DataFrame(index=month_index, columns=['OPEX', 'CAPEX']).fillna(0)
-        if not monthly_data.empty:
-            monthly.update(monthly_data)
-    else:
-        ytd = pd.DataFrame(index=pd.date_range(start=year_start, end=year_end, freq='D'))
-        month_index = [d.strftime('%Y-%m') for d in pd.date_range(start=year_start, end=pd.Timestamp('2025-12-01'), freq='MS')]
-        monthly = pd.DataFrame(index=month_index, columns=['OPEX', 'CAPEX']).fillna(0)
-        
-    layout = html.Div([
+    # One (day, category, type) result set feeds both charts
+    daily = pd.DataFrame(get_daily_summary(start, end),
+                         columns=['Date', 'Category', 'Type', 'Amount'])
+    ytd, monthly = build_matrices(daily, start, end)
+    return totals, ytd, monthly
+
+def quarter_shapes(month_keys):
+    """Dotted separators between fiscal quarters and shading on alternate ones."""
+    shapes = []
+    groups = quarter_groups(month_keys)
+    for index, group in enumerate(groups):
+        if index < len(groups) - 1:
+            shapes.append(dict(type='line', x0=group[-1], x1=group[-1], y0=0, y1=1.02, yref='paper',
+                               line=dict(color='rgba(44, 62, 80, 0.5)', width=2, dash='dot')))
+        if index % 2 == 0:
+            shapes.append(dict(type='rect', x0=group[0], x1=group[-1], y0=0, y1=1, yref='paper',
+                               fillcolor='rgba(220,220,220,0.2)', layer='below', line_width=0))
+    return shapes
+
+def build_ytd_figure(ytd):
+    """Cumulative Budget/Planned/Consumed line chart."""
+    import plotly.express as px
+    return px.line(
+        ytd, 
+        x=ytd.index, 
+        y=ytd.columns,
+        title='Cumulative Financial Progress',
+        labels={'value': 'Amount ($)', 'Date': 'Date', 'variable': 'Category'},
+        color_discrete_map={
+            'Budget': COLORS['Budget'],
+            'Planned': COLORS['Planned'],
+            'Consumed': COLORS['Consumed']
+        }
+    ).update_layout(
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        title={
+            'y':0.95,
+            'x':0.5,
+            'xanchor': 'center',
+            'yanchor': 'top',
+            'font': {'size': 20, 'color': COLORS['text']}
+        },
+        xaxis=dict(
+            showgrid=True,
+            gridwidth=1,
+            gridcolor='rgba(220,220,220,0.5)',
+            showline=True,
+            linewidth=2,
+            linecolor='rgba(0,0,0,0.2)',
+            title_font={'size': 14, 'color': COLORS['text']},
+            tickfont={'size': 12, 'color': COLORS['text']}
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridwidth=1,
+            gridcolor='rgba(220,220,220,0.5)',
+            showline=True,
+            linewidth=2,
+            linecolor='rgba(0,0,0,0.2)',
+            title_font={'size': 14, 'color': COLORS['text']},
+            tickfont={'size': 12, 'color': COLORS['text']},
+            tickformat='$,.0f'
+        ),
+        legend=dict(
+            bgcolor='rgba(255,255,255,0.8)',
+            bordercolor='rgba(0,0,0,0.1)',
+            borderwidth=1,
+            font={'size': 12, 'color': COLORS['text']}
+        ),
+        hovermode='x unified',
+        hoverlabel=dict(
+            bgcolor='white',
+            font_size=14,
+            font_family="Arial"
+        ),
+        height=450,
+        margin={'t': 60, 'b': 40, 'l': 40, 'r': 40}
+    )
+
+def build_monthly_figure(monthly):
+    """Stacked monthly OPEX/CAPEX bars with fiscal quarter markers."""
+    import plotly.express as px
+    return px.bar(
+        monthly,
+        x=monthly.index,
+        y=monthly.columns,
+        title='Monthly Financial Distribution',
+        labels={'value': 'Amount ($)', 'x': 'Month', 'variable': 'Type'},
+        barmode='stack',
+        color_discrete_map={
+            'OPEX': COLORS['OPEX'],
+            'CAPEX': COLORS['CAPEX']
+        }
+    ).update_layout(
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        title={
+            'y':0.95,
+            'x':0.5,
+            'xanchor': 'center',
+            'yanchor': 'top',
+            'font': {'size': 20, 'color': COLORS['text']}
+        },
+        xaxis=dict(
+            ticktext=month_tick_labels(monthly.index),
+            tickvals=monthly.index,
+            tickmode='array',
+            tickangle=45,
+            showgrid=True,
+            gridcolor='rgba(220,220,220,0.5)',
+            showline=True,
+            linewidth=2,
+            linecolor='rgba(0,0,0,0.2)',
+            title_font={'size': 14, 'color': COLORS['text']},
+            tickfont={'size': 12, 'color': COLORS['text']}
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor='rgba(220,220,220,0.5)',
+            showline=True,
+            linewidth=2,
+            linecolor='rgba(0,0,0,0.2)',
+            title_font={'size': 14, 'color': COLORS['text']},
+            tickfont={'size': 12, 'color': COLORS['text']},
+            tickformat='$,.0f'
+        ),
+        legend=dict(
+            bgcolor='rgba(255,255,255,0.8)',
+            bordercolor='rgba(0,0,0,0.1)',
+            borderwidth=1,
+            font={'size': 12, 'color': COLORS['text']}
+        ),
+        hovermode='x unified',
+        hoverlabel=dict(
+            bgcolor='white',
+            font_size=14,
+            font_family="Arial"
+        ),
+        height=450,
+        margin={'t': 60, 'b': 40, 'l': 40, 'r': 40},
+        bargap=0.15,
+        bargroupgap=0.1,
+        shapes=quarter_shapes(list(monthly.index))
+    )
+
+@cached_by_data_version(figure_cache)
+def dashboard_figures(start, end):
+    """(ytd, monthly) figures for [start, end] as plain JSON-ready dicts.
+
+    Cached per data version and period, so an unchanged dashboard is served
+    without invoking plotly.express or re-parsing the figure JSON."""
+    _, ytd, monthly = dashboard_aggregates(start, end)
+    return json.loads(build_ytd_figure(ytd).to_json()), json.loads(build_monthly_figure(monthly).to_json())
+
+def default_fiscal_year():
+    """Fiscal year of the latest transaction, or the current one for an empty ledger."""
+    _, last_day = get_date_bounds()
+    return fiscal_year_of(date.fromisoformat(last_day) if last_day else date.today())
+
+def period_selector(fiscal_year):
+    first_day, last_day = get_date_bounds()
+    year_options = fiscal_year_options(first_day and date.fromisoformat(first_day),
+                                       last_day and date.fromisoformat(last_day))
+    dropdown_style = {'width': '200px'}
+    return html.Div([
+        dcc.Dropdown(id='period-kind', options=PERIOD_KINDS, value='fiscal_year',
+                     clearable=False, style=dropdown_style),
+        dcc.Dropdown(id='period-year', options=year_options, value=fiscal_year,
+                     clearable=False, style=dropdown_style),
+        dcc.Dropdown(id='period-quarter', options=[{'label': f'Q{q}', 'value': q} for q in range(1, 5)],
+                     value=1, clearable=False, disabled=True, style=dropdown_style)
+    ], style={
+        'display': 'flex',
+        'justifyContent': 'flex-end',
+        'gap': '12px',
+        'marginBottom': '10px'
+    })
+
+def kpi_card(title, value_id, color):
+    return html.Div([
+        html.H4(title, style={'color': COLORS['text'], 'marginBottom': '10px'}),
+        html.H3('…', id=value_id,
+                style={'color': color,
+                       'fontSize': '28px',
+                       'fontWeight': 'bold'})
+    ], style={'background': 'white', 
+             'padding': '20px', 
+             'borderRadius': '10px',
+             'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)',
+             'flex': 1,
+             'margin': '0 10px',
+             'textAlign': 'center'})
+
+def kpi_panel():
+    return html.Div([
         html.H2('Key Performance Indicators', 
-                style={'color': colors['text'], 
+                style={'color': COLORS['text'], 
                        'textAlign': 'center',
-                       'marginBottom': '30px',
+                       'marginBottom': '8px',
                        'fontSize': '32px',
                        'fontWeight': '600'}),
+        html.P(id='kpi-period-label',
+               style={'color': COLORS['text'],
+                      'textAlign': 'center',
+                      'marginBottom': '30px',
+                      'fontSize': '16px'}),
         
         # KPI Cards Row
         html.Div([
-            html.Div([
-                html.H4('Total Yearly Budget', style={'color': colors['text'], 'marginBottom': '10px'}),
-                html.H3(f"${total_budget:,.0f}", 
-                       style={'color': colors['Budget'], 
-                             'fontSize': '28px',
-                             'fontWeight': 'bold'})
-            ], style={'background': 'white', 
-                     'padding': '20px', 
-                     'borderRadius': '10px',
-                     'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)',
-                     'flex': 1,
-                     'margin': '0 10px',
-                     'textAlign': 'center'}),
-            html.Div([
-                html.H4('Total Planned Consumption', style={'color': colors['text'], 'marginBottom': '10px'}),
-                html.H3(f"${total_planned:,.0f}", 
-                       style={'color': colors['Planned'],
-                             'fontSize': '28px',
-                             'fontWeight': 'bold'})
-            ], style={'background': 'white', 
-                     'padding': '20px', 
-                     'borderRadius': '10px',
-                     'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)',
-                     'flex': 1,
-                     'margin': '0 10px',
-                     'textAlign': 'center'}),
-            html.Div([
-                html.H4('Total Actual Consumed', style={'color': colors['text'], 'marginBottom': '10px'}),
-                html.H3(f"${total_consumed:,.0f}", 
-                       style={'color': colors['Consumed'],
-                             'fontSize': '28px',
-                             'fontWeight': 'bold'})
-            ], style={'background': 'white', 
-                     'padding': '20px', 
-                     'borderRadius': '10px',
-                     'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)',
-                     'flex': 1,
-                     'margin': '0 10px',
-                     'textAlign': 'center'}),
-            html.Div([
-                html.H4('Funding Gap', style={'color': colors['text'], 'marginBottom': '10px'}),
-                html.H3(f"${funding_gap:,.0f}", 
-                       style={'color': '#E74C3C' if funding_gap > 0 else '#27AE60',
-                             'fontSize': '28px',
-                             'fontWeight': 'bold'})
-            ], style={'background': 'white', 
-                     'padding': '20px', 
-                     'borderRadius': '10px',
-                     'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)',
-                     'flex': 1,
-                     'margin': '0 10px',
-                     'textAlign': 'center'})
+            kpi_card('Total Budget', 'kpi-budget', COLORS['Budget']),
+            kpi_card('Total Planned Consumption', 'kpi-planned', COLORS['Planned']),
+            kpi_card('Total Actual Consumed', 'kpi-consumed', COLORS['Consumed']),
+            kpi_card('Funding Gap', 'kpi-gap', '#27AE60')
         ], style={'display': 'flex',
                   'flexDirection': 'row',
                   'margin': '20px 0 40px 0',
-                  'gap': '20px'}),
+                  'gap': '20px'})
+    ])
 
-        # Graphs Container - Both in Same Row
+def charts_panel():
+    # Graphs Container - Both in Same Row
+    return html.Div([
+        # Left Graph - Year-to-Date
         html.Div([
-            # Left Graph - Year-to-Date
-            html.Div([
-                html.H2('Year-to-Date Overview', 
-                    style={'color': colors['text'], 
-                           'textAlign': 'center',
-                           'marginBottom': '20px',
-                           'fontSize': '24px',
-                           'fontWeight': '600'}),
-                dcc.Graph(
-                    figure=px.line(
-                        ytd, 
-                        x=ytd.index, 
-                        y=ytd.columns,
-                        title='Cumulative Financial Progress',
-                        labels={'value': 'Amount ($)', 'Date': 'Date', 'variable': 'Category'},
-                        color_discrete_map={
-                            'Budget': colors['Budget'],
-                            'Planned': colors['Planned'],
-                            'Consumed': colors['Consumed']
-                        }
-                    ).update_layout(
-                        plot_bgcolor='white',
-                        paper_bgcolor='white',
-                        title={
-                            'y':0.95,
-                            'x':0.5,
-                            'xanchor': 'center',
-                            'yanchor': 'top',
-                            'font': {'size': 20, 'color': colors['text']}
-                        },
-                        xaxis=dict(
-                            showgrid=True,
-                            gridwidth=1,
-                            gridcolor='rgba(220,220,220,0.5)',
-                            showline=True,
-                            linewidth=2,
-                            linecolor='rgba(0,0,0,0.2)',
-                            title_font={'size': 14, 'color': colors['text']},
-                            tickfont={'size': 12, 'color': colors['text']}
-                        ),
-                        yaxis=dict(
-                            showgrid=True,
-                            gridwidth=1,
-                            gridcolor='rgba(220,220,220,0.5)',
-                            showline=True,
-                            linewidth=2,
-                            linecolor='rgba(0,0,0,0.2)',
-                            title_font={'size': 14, 'color': colors['text']},
-                            tickfont={'size': 12, 'color': colors['text']},
-                            tickformat='$,.0f'
-                        ),
-                        legend=dict(
-                            bgcolor='rgba(255,255,255,0.8)',
-                            bordercolor='rgba(0,0,0,0.1)',
-                            borderwidth=1,
-                            font={'size': 12, 'color': colors['text']}
-                        ),
-                        hovermode='x unified',
-                        hoverlabel=dict(
-                            bgcolor='white',
-                            font_size=14,
-                            font_family="Arial"
-                        ),
-                        height=450,
-                        margin={'t': 60, 'b': 40, 'l': 40, 'r': 40}
-                    ),
-                    style={'height': '100%'}
-                )
-            ], style={
-                'flex': 1,
-                'marginRight': '20px',
-                'background': 'white',
-                'padding': '20px',
-                'borderRadius': '10px',
-                'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)'
-            }),
-            
-            # Right Graph - Monthly Analysis
-            html.Div([
-                html.H2('Monthly Analysis', 
-                    style={'color': colors['text'], 
-                           'textAlign': 'center',
-                           'marginBottom': '20px',
-                           'fontSize': '24px',
-                           'fontWeight': '600'}),
-                dcc.Graph(
-                    figure=px.bar(
-                        monthly,
-                        x=monthly.index,
-                        y=monthly.columns,
-                        title='Monthly Financial Distribution',
-                        labels={'value': 'Amount ($)', 'x': 'Month', 'variable': 'Type'},
-                        barmode='stack',
-                        color_discrete_map={
-                            'OPEX': colors['OPEX'],
-                            'CAPEX': colors['CAPEX']
-                        }
-                    ).update_layout(
-                        plot_bgcolor='white',
-                        paper_bgcolor='white',
-                        title={
-                            'y':0.95,
-                            'x':0.5,
-                            'xanchor': 'center',
-                            'yanchor': 'top',
-                            'font': {'size': 20, 'color': colors['text']}
-                        },
-                        xaxis=dict(
-                            ticktext=['Q1 - Jan', 'Feb', 'Mar', 
-                                    'Q2 - Apr', 'May', 'Jun', 
-                                    'Q3 - Jul', 'Aug', 'Sep', 
-                                    'Q4 - Oct', 'Nov', 'Dec'],
-                            tickvals=monthly.index,
-                            tickmode='array',
-                            tickangle=45,
-                            showgrid=True,
-                            gridcolor='rgba(220,220,220,0.5)',
-                            showline=True,
-                            linewidth=2,
-                            linecolor='rgba(0,0,0,0.2)',
-                            title_font={'size': 14, 'color': colors['text']},
-                            tickfont={'size': 12, 'color': colors['text']}
-                        ),
-                        yaxis=dict(
-                            showgrid=True,
-                            gridcolor='rgba(220,220,220,0.5)',
-                            showline=True,
-                            linewidth=2,
-                            linecolor='rgba(0,0,0,0.2)',
-                            title_font={'size': 14, 'color': colors['text']},
-                            tickfont={'size': 12, 'color': colors['text']},
-                            tickformat='$,.0f'
-                        ),
-                        legend=dict(
-                            bgcolor='rgba(255,255,255,0.8)',
-                            bordercolor='rgba(0,0,0,0.1)',
-                            borderwidth=1,
-                            font={'size': 12, 'color': colors['text']}
-                        ),
-                        hovermode='x unified',
-                        hoverlabel=dict(
-                            bgcolor='white',
-                            font_size=14,
-                            font_family="Arial"
-                        ),
-                        height=450,
-                        margin={'t': 60, 'b': 40, 'l': 40, 'r': 40},
-                        bargap=0.15,
-                        bargroupgap=0.1,
-                        shapes=[
-                            # Quarters separator lines
-                            dict(type='line', x0='2025-03', x1='2025-03', y0=0, y1=1.02, yref='paper',
-                                 line=dict(color='rgba(44, 62, 80, 0.5)', width=2, dash='dot')),
-                            dict(type='line', x0='2025-06', x1='2025-06', y0=0, y1=1.02, yref='paper',
-                                 line=dict(color='rgba(44, 62, 80, 0.5)', width=2, dash='dot')),
-                            dict(type='line', x0='2025-09', x1='2025-09', y0=0, y1=1.02, yref='paper',
-                                 line=dict(color='rgba(44, 62, 80, 0.5)', width=2, dash='dot')),
-                            # Quarter background shading
-                            dict(type='rect', x0='2025-01', x1='2025-03', y0=0, y1=1, yref='paper',
-                                 fillcolor='rgba(220,220,220,0.2)', layer='below', line_width=0),
-                            dict(type='rect', x0='2025-07', x1='2025-09', y0=0, y1=1, yref='paper',
-                                 fillcolor='rgba(220,220,220,0.2)', layer='below', line_width=0)
-                        ]
-                    ),
-                    style={'height': '100%'}
-                )
-            ], style={
-                'flex': 1,
-                'background': 'white',
-                'padding': '20px',
-                'borderRadius': '10px',
-                'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)'
-            })
+            html.H2('Cumulative Overview', 
+                style={'color': COLORS['text'], 
+                       'textAlign': 'center',
+                       'marginBottom': '20px',
+                       'fontSize': '24px',
+                       'fontWeight': '600'}),
+            dcc.Graph(
+                id='ytd-graph',
+                style={'height': '100%'}
+            )
         ], style={
-            'display': 'flex',
-            'gap': '24px',
-            'marginBottom': '40px',
-            'height': '550px'
+            'flex': 1,
+            'marginRight': '20px',
+            'background': 'white',
+            'padding': '20px',
+            'borderRadius': '10px',
+            'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)'
         }),
+        
+        # Right Graph - Monthly Analysis
+        html.Div([
+            html.H2('Monthly Analysis', 
+                style={'color': COLORS['text'], 
+                       'textAlign': 'center',
+                       'marginBottom': '20px',
+                       'fontSize': '24px',
+                       'fontWeight': '600'}),
+            dcc.Graph(
+                id='monthly-graph',
+                style={'height': '100%'}
+            )
+        ], style={
+            'flex': 1,
+            'background': 'white',
+            'padding': '20px',
+            'borderRadius': '10px',
+            'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)'
+        })
+    ], style={
+        'display': 'flex',
+        'gap': '24px',
+        'marginBottom': '40px',
+        'height': '550px'
+    })
+
+def summary_columns(view):
+    if view in SUMMARY_GROUPS:
+        names, numeric = group_total_columns(view), lambda name: name != SUMMARY_GROUPS[view][0]
+    else:
+        names, numeric = DISPLAY_COLUMNS, lambda name: name == 'Amount'
+    return [{'name': name, 'id': name, 'type': 'numeric' if numeric(name) else 'text'} for name in names]
+
+def period_filter_query(start, end):
+    """DataTable filter_query selecting [start, end], shared by the table and the export link."""
+    return f'{{Date}} >= {start:%Y-%m-%d} && {{Date}} <= {end:%Y-%m-%d}'
+
+def summary_page(view, start, end, page_current=0, sort_by=None, page_size=SUMMARY_PAGE_SIZE):
+    """(records, page_count, page) for one page of a summary view over [start, end];
+    page is page_current clamped to the pages that exist."""
+    if view in SUMMARY_GROUPS:
+        columns = group_total_columns(view)
+        total = count_groups(view, start, end)
+        order_by = sort_by_to_sql(sort_by, columns, tiebreak=SUMMARY_GROUPS[view][1])
+    else:
+        where, params = filter_query_to_sql(period_filter_query(start, end))
+        total = count_transactions(where, params)
+        order_by = sort_by_to_sql(sort_by)
+    page_count = max(1, -(-total // page_size))
+    page = min(page_current or 0, page_count - 1)
+    if view in SUMMARY_GROUPS:
+        rows = query_group_totals(view, start, end, order_by, limit=page_size, offset=page * page_size)
+    else:
+        rows = query_transactions(where, params, order_by, limit=page_size, offset=page * page_size)
+    return rows, page_count, page
 
+def summary_panel():
+    return html.Div([
         # Transaction Summary Section
         html.H2('Detailed Transaction Summary', 
-                style={'color': colors['text'], 
+                style={'color': COLORS['text'], 
                        'textAlign': 'center',
                        'marginBottom': '20px',
                        'fontSize': '28px',
                        'fontWeight': '600'}),
         html.Div([
+            dcc.RadioItems(
+                id='summary-view',
+                options=SUMMARY_VIEWS,
+                value='transactions',
+                inline=True,
+                inputStyle={'marginRight': '6px', 'marginLeft': '16px'},
+                style={'color': COLORS['text'], 'marginBottom': '16px'}
+            ),
+            # Only the visible page is fetched, see update_summary_table
             dash_table.DataTable(
-                data=df.to_dict('records'),
-                columns=[{'name': i, 'id': i} for i in expected_cols],
-                page_size=10,
+                id='summary-table',
+                data=[],
+                columns=summary_columns('transactions'),
+                page_current=0,
+                page_size=SUMMARY_PAGE_SIZE,
+                page_count=1,
+                page_action='custom',
+                sort_action='custom',
+                sort_by=[],
                 style_header={
-                    'backgroundColor': colors['text'],
+                    'backgroundColor': COLORS['text'],
                     'color': 'white',
                     'fontWeight': 'bold',
                     'textAlign': 'center',
@@ -346,7 +393,7 @@ def dashboard_page():
                 },
                 style_data={
                     'backgroundColor': 'white',
-                    'color': colors['text']
+                    'color': COLORS['text']
                 },
                 style_data_conditional=[
                     {
@@ -355,30 +402,35 @@ def dashboard_page():
                     }
                 ],
                 style_table={
-                    'border': f'1px solid {colors["text"]}',
+                    'border': f'1px solid {COLORS["text"]}',
                     'borderRadius': '10px',
                     'overflow': 'hidden'
                 }
             ),
             html.Div([
-                html.Button(
-                    'Export to CSV',
-                    id='download-button',
-                    style={
-                        'backgroundColor': colors['text'],
-                        'color': 'white',
-                        'border': 'none',
-                        'padding': '10px 20px',
-                        'borderRadius': '5px',
-                        'cursor': 'pointer',
-                        'fontSize': '14px',
-                        'fontWeight': 'bold',
-                        'marginTop': '20px',
-                        'transition': 'background-color 0.3s',
-                        ':hover': {
-                            'backgroundColor': '#34495E'
+                html.A(
+                    html.Button(
+                        'Export to CSV',
+                        id='download-button',
+                        style={
+                            'backgroundColor': COLORS['text'],
+                            'color': 'white',
+                            'border': 'none',
+                            'padding': '10px 20px',
+                            'borderRadius': '5px',
+                            'cursor': 'pointer',
+                            'fontSize': '14px',
+                            'fontWeight': 'bold',
+                            'marginTop': '20px',
+                            'transition': 'background-color 0.3s',
+                            ':hover': {
+                                'backgroundColor': '#34495E'
+                            }
                         }
-                    }
+                    ),
+                    id='summary-export-link',
+                    href=export_url(),
+                    download='transactions.csv'
                 )
             ], style={'textAlign': 'right'})
         ], style={
@@ -388,10 +440,205 @@ def dashboard_page():
             'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)',
             'marginBottom': '40px'
         })
+    ])
+
+FORECAST_COLUMNS = ['Cost Center Project', 'Budget', 'Consumed to date', 'Projected (linear)',
+                    'Projected (seasonal)', 'Projected gap']
+
+def forecast_records(forecast):
+    """Forecast table rows, an all-cost-centers total first; the gap uses the seasonal projection."""
+    columns = ['budget', 'consumed', 'linear', 'seasonal']
+    rows = [('All cost centers', *(sum(forecast[column]) for column in columns))]
+    rows += zip(forecast['centers'], *(forecast[column] for column in columns))
+    return [dict(zip(FORECAST_COLUMNS, (center or '(blank)', round(budget, 2), round(consumed, 2),
+                                        round(linear, 2), round(seasonal, 2), round(seasonal - budget, 2))))
+            for center, budget, consumed, linear, seasonal in rows]
+
+def forecast_panel():
+    return html.Div([
+        html.H2('Year-end Forecast', 
+                style={'color': COLORS['text'], 
+                       'textAlign': 'center',
+                       'marginBottom': '8px',
+                       'fontSize': '28px',
+                       'fontWeight': '600'}),
+        html.P('Consumed spend projected to the end of the selected period. Linear extends the '
+               'average monthly burn; seasonal extends a 3-month moving average shaped by last year.',
+               style={'color': COLORS['text'], 'textAlign': 'center', 'marginBottom': '20px'}),
+        html.Div([
+            dash_table.DataTable(
+                id='forecast-table',
+                data=[],
+                columns=[{'name': name, 'id': name, 'type': 'text' if name == 'Cost Center Project' else 'numeric',
+                          'format': {'specifier': ',.0f'}} for name in FORECAST_COLUMNS],
+                page_size=SUMMARY_PAGE_SIZE,
+                sort_action='native',
+                style_header={
+                    'backgroundColor': COLORS['text'],
+                    'color': 'white',
+                    'fontWeight': 'bold',
+                    'textAlign': 'center',
+                    'fontSize': '14px',
+                    'padding': '12px'
+                },
+                style_cell={
+                    'textAlign': 'left',
+                    'padding': '12px',
+                    'fontSize': '13px'
+                },
+                style_data_conditional=[
+                    {
+                        'if': {'row_index': 'odd'},
+                        'backgroundColor': 'rgb(248, 249, 250)'
+                    },
+                    {
+                        'if': {'filter_query': '{Projected gap} > 0', 'column_id': 'Projected gap'},
+                        'color': '#E74C3C',
+                        'fontWeight': 'bold'
+                    }
+                ],
+                style_table={
+                    'border': f'1px solid {COLORS["text"]}',
+                    'borderRadius': '10px',
+                    'overflow': 'hidden'
+                }
+            )
+        ], style={
+            'background': 'white',
+            'padding': '20px',
+            'borderRadius': '10px',
+            'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)',
+            'marginBottom': '40px'
+        })
+    ])
+
+def period_data(kind='fiscal_year', fiscal_year=None, quarter=None):
+    start, end, label = resolve_period(kind, fiscal_year, quarter)
+    return {'start': start.isoformat(), 'end': end.isoformat(), 'label': label}
+
+def _period_bounds(period):
+    return date.fromisoformat(period['start']), date.fromisoformat(period['end'])
+
+def dashboard_page():
+    """Main dashboard page function that renders the dashboard layout.
+
+    The layout is only the panel skeletons; each panel is filled by its own
+    callback from the dashboard-period and dashboard-version stores, so a
+    period change or a new transaction only recomputes what it affects."""
+    fiscal_year = default_fiscal_year()
+    return html.Div([
+        period_selector(fiscal_year),
+        dcc.Store(id='dashboard-period', data=period_data('fiscal_year', fiscal_year)),
+        dcc.Store(id='dashboard-version', data=get_data_version()),
+        dcc.Interval(id='dashboard-poll', interval=DASHBOARD_POLL_MS),
+        kpi_panel(),
+        charts_panel(),
+        forecast_panel(),
+        summary_panel()
     ], style={
         'padding': '20px',
-        'backgroundColor': colors['background'],
+        'backgroundColor': COLORS['background'],
         'minHeight': '100vh'
     })
-    
-    return layout
+
+def register_callbacks(app):
+    @app.callback(
+        Output('dashboard-period', 'data'),
+        Output('period-year', 'disabled'),
+        Output('period-quarter', 'disabled'),
+        Input('period-kind', 'value'),
+        Input('period-year', 'value'),
+        Input('period-quarter', 'value'),
+        prevent_initial_call=True
+    )
+    def update_period(kind, fiscal_year, quarter):
+        return period_data(kind, fiscal_year, quarter), kind == 'rolling_12', kind != 'quarter'
+
+    # Only touch the version store when the ledger actually changed, so idle
+    # polls do not re-run any panel
+    @app.callback(
+        Output('dashboard-version', 'data'),
+        Input('dashboard-poll', 'n_intervals'),
+        State('dashboard-version', 'data'),
+        prevent_initial_call=True
+    )
+    def poll_data_version(n_intervals, known_version):
+        version = get_data_version()
+        return version if version != known_version else no_update
+
+    @app.callback(
+        Output('kpi-period-label', 'children'),
+        Output('kpi-budget', 'children'),
+        Output('kpi-planned', 'children'),
+        Output('kpi-consumed', 'children'),
+        Output('kpi-gap', 'children'),
+        Output('kpi-gap', 'style'),
+        Input('dashboard-period', 'data'),
+        Input('dashboard-version', 'data')
+    )
+    def update_kpis(period, version):
+        start, end = _period_bounds(period)
+        # Keep this period warm in the background after future writes
+        remember_period(start, end)
+        totals, _, _ = dashboard_aggregates(start, end)
+        total_budget = totals.get('Budget', 0)
+        total_planned = totals.get('Planned', 0)
+        total_consumed = totals.get('Consumed', 0)
+        funding_gap = total_consumed - total_budget
+        # Only the colour changes, so patch it instead of resending the style
+        gap_style = Patch()
+        gap_style['color'] = '#E74C3C' if funding_gap > 0 else '#27AE60'
+        return (f"{period['label']} · {period['start']} to {period['end']}",
+                f"${total_budget:,.0f}", f"${total_planned:,.0f}", f"${total_consumed:,.0f}",
+                f"${funding_gap:,.0f}", gap_style)
+
+    @app.callback(
+        Output('ytd-graph', 'figure'),
+        Input('dashboard-period', 'data'),
+        Input('dashboard-version', 'data')
+    )
+    def update_ytd_graph(period, version):
+        ytd_figure, _ = dashboard_figures(*_period_bounds(period))
+        return ytd_figure
+
+    @app.callback(
+        Output('monthly-graph', 'figure'),
+        Input('dashboard-period', 'data'),
+        Input('dashboard-version', 'data')
+    )
+    def update_monthly_graph(period, version):
+        _, monthly_figure = dashboard_figures(*_period_bounds(period))
+        return monthly_figure
+
+    @app.callback(
+        Output('summary-table', 'data'),
+        Output('summary-table', 'columns'),
+        Output('summary-table', 'page_count'),
+        Output('summary-table', 'page_current'),
+        Input('summary-view', 'value'),
+        Input('summary-table', 'page_current'),
+        Input('summary-table', 'sort_by'),
+        Input('dashboard-period', 'data'),
+        Input('dashboard-version', 'data')
+    )
+    def update_summary_table(view, page_current, sort_by, period, version):
+        start, end = _period_bounds(period)
+        rows, page_count, page = summary_page(view, start, end, page_current, sort_by)
+        return rows, summary_columns(view), page_count, page
+
+    @app.callback(
+        Output('summary-export-link', 'href'),
+        Input('dashboard-period', 'data')
+    )
+    def update_summary_export_link(period):
+        return export_url(period_filter_query(*_period_bounds(period)))
+
+    @app.callback(
+        Output('forecast-table', 'data'),
+        Input('dashboard-period', 'data'),
+        Input('dashboard-version', 'data')
+    )
+    def update_forecast(period, version):
+        # NumPy loads with the first forecast, not at startup
+        from utils.forecast import forecast_year_end
+        return forecast_records(forecast_year_end(*_period_bounds(period), date.today()))
@@ -0,0 +1,149 @@
+from dash import dcc, html, dash_table, ctx, no_update
+from dash.dependencies import Input, Output, State, ALL
+from utils.db import (DISPLAY_COLUMNS, DRILL_LEVELS, GROUP_TOTAL_COLUMNS, count_rollup, count_transactions,
+                      get_rollup, po_filter, query_transactions)
+
+PAGE_SIZE = 15
+
+# Color scheme
+COLORS = {
+    'primary': '#2E86C1',
+    'background': '#F8F9F9',
+    'text': '#2C3E50',
+    'textLight': '#7F8C8D',
+    'white': '#FFFFFF'
+}
+
+CARD_STYLE = {
+    'background': COLORS['white'],
+    'borderRadius': '12px',
+    'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)',
+    'padding': '24px',
+    'marginBottom': '24px'
+}
+
+CRUMB_STYLE = {
+    'background': 'none',
+    'border': 'none',
+    'color': COLORS['primary'],
+    'cursor': 'pointer',
+    'fontSize': '15px',
+    'padding': '0 4px'
+}
+
+def drilldown_columns(path):
+    """Table columns for the level below `path`; below a PO, its transactions."""
+    if len(path) == len(DRILL_LEVELS):
+        return [{'name': name, 'id': name, 'type': 'numeric' if name == 'Amount' else 'text'}
+                for name in DISPLAY_COLUMNS]
+    label, _ = DRILL_LEVELS[len(path)]
+    return [{'name': name, 'id': name, 'type': 'text' if name == label else 'numeric'}
+            for name in (label, *GROUP_TOTAL_COLUMNS)]
+
+def drilldown_rows(path, page_current=0, page_size=PAGE_SIZE):
+    """(records, page_count, page) for one page of the level below `path`;
+    page is page_current clamped to the pages that exist."""
+    if len(path) == len(DRILL_LEVELS):
+        where, params = po_filter(*path)
+        total = count_transactions(where, params)
+    else:
+        total = count_rollup(path)
+    page_count = max(1, -(-total // page_size))
+    page = min(page_current or 0, page_count - 1)
+    if len(path) == len(DRILL_LEVELS):
+        rows = query_transactions(where, params, 'date, id', limit=page_size, offset=page * page_size)
+    else:
+        rows = get_rollup(path, limit=page_size, offset=page * page_size)
+    return rows, page_count, page
+
+def breadcrumbs(path):
+    crumbs = [html.Button('All projects', id={'type': 'drill-crumb', 'index': 0}, style=CRUMB_STYLE)]
+    for index, key in enumerate(path, start=1):
+        crumbs.append(html.Span('›', style={'color': COLORS['textLight']}))
+        crumbs.append(html.Button(key or '(blank)', id={'type': 'drill-crumb', 'index': index}, style=CRUMB_STYLE))
+    return crumbs
+
+def drilldown_page():
+    """Cost-center drill-down: projects, then a project's SOWs, then a SOW's POs,
+    then the transactions behind one PO. Each level reads the rollup table."""
+    return html.Div([
+        dcc.Store(id='drill-path', data=[]),
+        html.H2('Cost Center Drill-down',
+                style={'color': COLORS['text'], 'marginBottom': '8px', 'fontWeight': '600'}),
+        html.P('Click a row to drill into it; use the breadcrumb to go back up.',
+               style={'color': COLORS['textLight'], 'marginBottom': '20px'}),
+        html.Div([
+            html.Div(breadcrumbs([]), id='drill-breadcrumbs',
+                     style={'display': 'flex', 'alignItems': 'center', 'marginBottom': '16px'}),
+            dash_table.DataTable(
+                id='drilldown-table',
+                data=[],
+                columns=drilldown_columns([]),
+                page_current=0,
+                page_size=PAGE_SIZE,
+                page_count=1,
+                page_action='custom',
+                style_header={
+                    'backgroundColor': COLORS['text'],
+                    'color': 'white',
+                    'fontWeight': 'bold',
+                    'textAlign': 'left',
+                    'padding': '12px'
+                },
+                style_cell={
+                    'textAlign': 'left',
+                    'padding': '12px',
+                    'fontSize': '13px',
+                    'cursor': 'pointer'
+                },
+                style_data_conditional=[
+                    {
+                        'if': {'row_index': 'odd'},
+                        'backgroundColor': 'rgb(248, 249, 250)'
+                    }
+                ]
+            )
+        ], style=CARD_STYLE)
+    ], style={
+        'padding': '20px',
+        'backgroundColor': COLORS['background'],
+        'minHeight': '100vh'
+    })
+
+def register_callbacks(app):
+    @app.callback(
+        Output('drill-path', 'data'),
+        Output('drilldown-table', 'active_cell'),
+        Input('drilldown-table', 'active_cell'),
+        Input({'type': 'drill-crumb', 'index': ALL}, 'n_clicks'),
+        State('drilldown-table', 'data'),
+        State('drill-path', 'data'),
+        prevent_initial_call=True
+    )
+    def navigate_drilldown(active_cell, crumb_clicks, rows, path):
+        trigger = ctx.triggered_id
+        if isinstance(trigger, dict):
+            # Re-rendered breadcrumbs fire with n_clicks None; only real clicks navigate
+            if not ctx.triggered[0]['value']:
+                return no_update, no_update
+            return path[:trigger['index']], None
+        if not active_cell or len(path) == len(DRILL_LEVELS) or active_cell['row'] >= len(rows):
+            return no_update, None
+        label, _ = DRILL_LEVELS[len(path)]
+        return path + [rows[active_cell['row']][label]], None
+
+    @app.callback(
+        Output('drilldown-table', 'data'),
+        Output('drilldown-table', 'columns'),
+        Output('drilldown-table', 'page_count'),
+        Output('drilldown-table', 'page_current'),
+        Output('drill-breadcrumbs', 'children'),
+        Input('drill-path', 'data'),
+        Input('drilldown-table', 'page_current')
+    )
+    def update_drilldown(path, page_current):
+        # A new level starts on its first page
+        if ctx.triggered_id == 'drill-path':
+            page_current = 0
+        rows, page_count, page = drilldown_rows(path, page_current)
+        return rows, drilldown_columns(path), page_count, page, breadcrumbs(path)
@@ -0,0 +1,70 @@
+from dash import dcc, html, dash_table, Input, Output, State, no_update
+from datetime import datetime
+from utils.instrumentation import CACHES, METRICS_PATH, recorder
+from utils.sessions import get_session_user
+
+REFRESH_MS = 5 * 1000
+RECENT_EVENTS = 50
+
+SUMMARY_COLUMNS = ['kind', 'name', 'count', 'avg_ms', 'p95_ms', 'max_ms', 'total_ms', 'rows', 'bytes']
+RECENT_COLUMNS = ['time', 'kind', 'name', 'ms', 'rows', 'bytes']
+CACHE_COLUMNS = ['cache', 'size', 'maxsize', 'bytes', 'hits', 'misses', 'evictions', 'hit_ratio',
+                 'builds', 'avg_build_ms', 'last_build_ms']
+
+TABLE_STYLE = {
+    'style_header': {'backgroundColor': '#003366', 'color': 'white', 'fontWeight': 'bold'},
+    'style_cell': {'textAlign': 'left', 'padding': '8px', 'fontSize': '13px'},
+}
+
+def summary_records():
+    return [{**row, **{key: round(row[key], 2) for key in ('avg_ms', 'p95_ms', 'max_ms', 'total_ms')}}
+            for row in recorder.summary()]
+
+def recent_records():
+    return [{'time': datetime.fromtimestamp(event['at']).strftime('%H:%M:%S'), 'kind': event['kind'],
+             'name': event['name'], 'ms': round(1000 * event['seconds'], 2),
+             'rows': event['rows'], 'bytes': event['bytes']}
+            for event in recorder.recent(RECENT_EVENTS)]
+
+def cache_records():
+    return [{'cache': name, **{key: round(value, 2) if isinstance(value, float) else value
+                               for key, value in cache.stats().items() if key in CACHE_COLUMNS}}
+            for name, cache in CACHES]
+
+def metrics_page(current_user):
+    if current_user != 'admin':
+        return html.Div([
+            html.H3('Metrics'),
+            html.P('Access denied. Only admin can view metrics.')
+        ])
+    return html.Div([
+        html.H3('Callback and Query Metrics'),
+        html.P(['Totals since the process started; p95 covers the most recent events. '
+                'Prometheus scrapes the same totals from ', html.Code(METRICS_PATH), '.']),
+        dcc.Interval(id='metrics-refresh', interval=REFRESH_MS),
+        html.H4('By callback, route and query'),
+        dash_table.DataTable(id='metrics-summary-table', data=summary_records(),
+                             columns=[{'name': c, 'id': c} for c in SUMMARY_COLUMNS],
+                             sort_action='native', page_size=25, **TABLE_STYLE),
+        html.H4('Recent events', style={'marginTop': '24px'}),
+        dash_table.DataTable(id='metrics-recent-table', data=recent_records(),
+                             columns=[{'name': c, 'id': c} for c in RECENT_COLUMNS],
+                             page_size=RECENT_EVENTS, **TABLE_STYLE),
+        html.H4('Caches', style={'marginTop': '24px'}),
+        dash_table.DataTable(id='metrics-cache-table', data=cache_records(),
+                             columns=[{'name': c, 'id': c} for c in CACHE_COLUMNS], **TABLE_STYLE)
+    ], style={'padding': '20px'})
+
+def register_callbacks(app):
+    @app.callback(
+        Output('metrics-summary-table', 'data'),
+        Output('metrics-recent-table', 'data'),
+        Output('metrics-cache-table', 'data'),
+        Input('metrics-refresh', 'n_intervals'),
+        State('session-token', 'data'),
+        prevent_initial_call=True
+    )
+    def refresh_metrics(n_intervals, token):
+        if get_session_user(token) != 'admin':
+            return no_update, no_update, no_update
+        return summary_records(), recent_records(), cache_records()
@@ -1,5 +1,5 @@
 from dash import dcc, html
-from utils.users import USERS
+from utils.users import get_user
 
 def profile_page(current_user):
     if not current_user:
@@ -7,7 +7,7 @@ def profile_page(current_user):
             html.H3('Profile'),
             html.P('You must be logged in to view your profile.')
         ])
-    user_info = USERS.get(current_user, {})
+    user_info = get_user(current_user) or {}
     return html.Div([
         html.H3('Profile'),
         html.P(f'Username: {current_user}'),
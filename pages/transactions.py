@@ -1,10 +1,23 @@
 
 
-from dash import dcc, html, Input, Output, State
+from dash import dcc, html, Input, Output, State, Patch, no_update
 from dash import dash_table
 from datetime import datetime
-from utils.db import get_transactions_df, add_transaction
-import pandas as pd
+import base64
+import io
+from utils.db import (add_transaction, count_transactions, get_last_transaction_id, get_transaction_stats,
+                      get_transactions_since, query_transactions, CATEGORIES, DISPLAY_COLUMNS, TYPES)
+from utils.importer import import_transactions, format_report
+from utils.export import export_url
+from utils.filters import filter_query_to_sql, sort_by_to_sql, NUMERIC_COLUMNS
+from utils.worker import background_callback, notify_write
+
+PAGE_SIZE = 10
+
+# How often an open transactions page asks for rows added since its last poll,
+# and how many of those it keeps in the "new since opened" table
+POLL_MS = 15 * 1000
+NEW_ROWS_LIMIT = 50
 
 # Color scheme
 COLORS = {
@@ -66,14 +79,16 @@ BUTTON_STYLE = {
 
 
 def transactions_page():
-    df = get_transactions_df()
-    
     # Calculate stats
-    total_transactions = len(df) if not df.empty else 0
-    total_amount = df['Amount'].sum() if not df.empty else 0
-    latest_date = df['Date'].max() if not df.empty else 'No transactions'
+    total_transactions, total_amount, latest_date = get_transaction_stats()
+    latest_date = latest_date or 'No transactions'
+    # Polls send only this watermark and receive only newer rows, see poll_new_transactions
+    sync = {'last_id': get_last_transaction_id(), 'count': total_transactions,
+            'total': total_amount, 'latest': latest_date, 'shown': 0}
     
     return html.Div([
+        dcc.Store(id='transactions-sync', data=sync),
+        dcc.Interval(id='transactions-poll', interval=POLL_MS),
         # Header with Stats
         html.Div([
             html.H1('Finance Transaction Center', style={
@@ -94,7 +109,7 @@ def transactions_page():
                             'marginBottom': '8px',
                             'fontSize': '16px'
                         }),
-                        html.H2(f"{total_transactions:,}", style={
+                        html.H2(f"{total_transactions:,}", id='stat-count', style={
                             'color': COLORS['primary'],
                             'margin': '0',
                             'fontSize': '28px',
@@ -108,7 +123,7 @@ def transactions_page():
                             'marginBottom': '8px',
                             'fontSize': '16px'
                         }),
-                        html.H2(f"${total_amount:,.2f}", style={
+                        html.H2(f"${total_amount:,.2f}", id='stat-total', style={
                             'color': COLORS['success'],
                             'margin': '0',
                             'fontSize': '28px',
@@ -122,7 +137,7 @@ def transactions_page():
                             'marginBottom': '8px',
                             'fontSize': '16px'
                         }),
-                        html.H2(str(latest_date).split()[0], style={
+                        html.H2(str(latest_date).split()[0], id='stat-latest', style={
                             'color': COLORS['warning'],
                             'margin': '0',
                             'fontSize': '28px',
@@ -141,7 +156,8 @@ def transactions_page():
             html.Div([
                 # Left Column - Form
                 html.Div([
-                    transaction_form()
+                    transaction_form(),
+                    import_panel()
                 ], style={'flex': '1'}),
                 
                 # Right Column - Table
@@ -154,10 +170,15 @@ def transactions_page():
                                 'fontSize': '20px',
                                 'fontWeight': '600'
                             }),
-                            html.Button(
-                                '⬇ Export CSV',
-                                id='download-button',
-                                style=BUTTON_STYLE
+                            html.A(
+                                html.Button(
+                                    '⬇ Export CSV',
+                                    id='download-button',
+                                    style=BUTTON_STYLE
+                                ),
+                                id='download-link',
+                                href=export_url(),
+                                download='transactions.csv'
                             )
                         ], style={
                             'display': 'flex',
@@ -166,11 +187,15 @@ def transactions_page():
                             'marginBottom': '16px'
                         }),
                         
+                        # Paging, sorting and filtering run in SQLite via update_transactions_table
                         dash_table.DataTable(
                             id='transactions-table',
-                            data=df.to_dict('records'),
-                            columns=[{'name': i, 'id': i} for i in df.columns],
-                            page_size=10,
+                            data=[],
+                            columns=[{'name': i, 'id': i, 'type': 'numeric' if i in NUMERIC_COLUMNS else 'text'}
+                                     for i in DISPLAY_COLUMNS],
+                            page_current=0,
+                            page_size=PAGE_SIZE,
+                            page_count=1,
                             style_header={
                                 'backgroundColor': COLORS['secondary'],
                                 'color': COLORS['white'],
@@ -195,11 +220,13 @@ def transactions_page():
                                     'backgroundColor': COLORS['light']
                                 }
                             ],
-                            sort_action='native',
-                            filter_action='native',
+                            sort_action='custom',
+                            sort_by=[],
+                            filter_action='custom',
+                            filter_query='',
                             row_selectable='multi',
                             selected_rows=[],
-                            page_action='native',
+                            page_action='custom',
                             style_table={
                                 'overflowX': 'auto',
                                 'border': f'1px solid {COLORS["border"]}',
@@ -216,7 +243,8 @@ def transactions_page():
                             'fontWeight': '500',
                             'display': 'none'
                         })
-                    ], style=CARD_STYLE)
+                    ], style=CARD_STYLE),
+                    new_transactions_panel()
                 ], style={'flex': '2'})
             ], style={
                 'display': 'flex',
@@ -232,6 +260,43 @@ def transactions_page():
         'minHeight': '100vh'
     })
 
+def new_transactions_panel():
+    """Rows added since the page was opened, newest first; filled by polling."""
+    return html.Div([
+        html.H3('New Since You Opened This Page', style={
+            'color': COLORS['text'],
+            'marginTop': '0',
+            'marginBottom': '16px',
+            'fontSize': '20px',
+            'fontWeight': '600'
+        }),
+        dash_table.DataTable(
+            id='new-transactions-table',
+            data=[],
+            columns=[{'name': i, 'id': i, 'type': 'numeric' if i in NUMERIC_COLUMNS else 'text'}
+                     for i in DISPLAY_COLUMNS],
+            page_size=PAGE_SIZE,
+            style_header={
+                'backgroundColor': COLORS['secondary'],
+                'color': COLORS['white'],
+                'fontWeight': '600',
+                'textAlign': 'left',
+                'padding': '12px',
+                'fontSize': '14px'
+            },
+            style_cell={
+                'textAlign': 'left',
+                'padding': '12px',
+                'fontSize': '13px'
+            },
+            style_table={
+                'overflowX': 'auto',
+                'border': f'1px solid {COLORS["border"]}',
+                'borderRadius': '6px'
+            }
+        )
+    ], style=CARD_STYLE)
+
 # Transaction form layout
 def transaction_form():
     return html.Div([
@@ -253,8 +318,6 @@ def transaction_form():
                     dcc.DatePickerSingle(
                         id='date',
                         date=datetime.today().strftime('%Y-%m-%d'),
-                        min_date_allowed='2025-01-01',
-                        max_date_allowed='2025-12-31',
                         style={'width': '100%'},
                         calendar_orientation='horizontal',
                         display_format='YYYY-MM-DD',
@@ -304,7 +367,7 @@ def transaction_form():
             html.Label('Category *', style=LABEL_STYLE),
             dcc.Dropdown(
                 id='category',
-                options=[{'label': c, 'value': c} for c in ['Budget', 'Planned', 'Consumed']],
+                options=[{'label': c, 'value': c} for c in CATEGORIES],
                 value='Budget',
                 style={
                     'borderRadius': '6px',
@@ -318,7 +381,7 @@ def transaction_form():
             html.Label('Type *', style=LABEL_STYLE),
             dcc.Dropdown(
                 id='type',
-                options=[{'label': t, 'value': t} for t in ['OPEX', 'CAPEX']],
+                options=[{'label': t, 'value': t} for t in TYPES],
                 value='OPEX',
                 style={
                     'borderRadius': '6px',
@@ -346,10 +409,110 @@ def transaction_form():
         )
     ], style=CARD_STYLE)
 
+# Bulk import panel
+def import_panel():
+    return html.Div([
+        html.H3('Bulk Import', style={
+            'color': COLORS['text'],
+            'marginTop': '0',
+            'marginBottom': '16px',
+            'textAlign': 'center',
+            'fontSize': '24px',
+            'fontWeight': '600'
+        }),
+        dcc.Upload(
+            id='import-upload',
+            children=html.Div(['Drop a CSV or Parquet export here, or ', html.A('select a file')]),
+            accept='.csv,.parquet',
+            style={
+                'borderWidth': '2px',
+                'borderStyle': 'dashed',
+                'borderColor': COLORS['border'],
+                'borderRadius': '6px',
+                'padding': '24px',
+                'textAlign': 'center',
+                'color': COLORS['textLight'],
+                'cursor': 'pointer'
+            }
+        ),
+        html.Div(
+            'Columns: Date, Cost Center Project, Cost Center SOW, SOW Number, PO, Amount, Category, Type',
+            style={
+                'color': COLORS['textLight'],
+                'fontSize': '12px',
+                'marginTop': '12px',
+                'textAlign': 'center'
+            }
+        ),
+        html.Div(id='import-msg', style={
+            'marginTop': '16px',
+            'color': COLORS['text'],
+            'fontSize': '13px'
+        })
+    ], style=CARD_STYLE)
+
 # Callback for form and table update
 def register_callbacks(app):
     @app.callback(
         Output('transactions-table', 'data'),
+        Output('transactions-table', 'page_count'),
+        Output('transactions-table', 'page_current'),
+        Input('transactions-table', 'page_current'),
+        Input('transactions-table', 'page_size'),
+        Input('transactions-table', 'sort_by'),
+        Input('transactions-table', 'filter_query'),
+        Input('transactions-sync', 'data')
+    )
+    def update_transactions_table(page_current, page_size, sort_by, filter_query, sync):
+        page_size = page_size or PAGE_SIZE
+        where, params = filter_query_to_sql(filter_query)
+        total = count_transactions(where, params)
+        page_count = max(1, -(-total // page_size))
+        # A narrower filter can leave the current page past the end; the clamped
+        # page goes back to the table so its page indicator agrees
+        page = min(page_current or 0, page_count - 1)
+        rows = query_transactions(where, params, sort_by_to_sql(sort_by),
+                                  limit=page_size, offset=page * page_size)
+        return rows, page_count, page
+
+    @app.callback(
+        Output('transactions-sync', 'data'),
+        Output('new-transactions-table', 'data'),
+        Output('stat-count', 'children'),
+        Output('stat-total', 'children'),
+        Output('stat-latest', 'children'),
+        Input('transactions-poll', 'n_intervals'),
+        State('transactions-sync', 'data'),
+        prevent_initial_call=True
+    )
+    def poll_new_transactions(n_intervals, sync):
+        # One row past the limit tells us whether the fetched rows are all of them
+        rows = get_transactions_since(sync['last_id'], limit=NEW_ROWS_LIMIT + 1)
+        if not rows:
+            return no_update, no_update, no_update, no_update, no_update
+        if len(rows) > NEW_ROWS_LIMIT:
+            # A bulk import: recount once and show the newest rows
+            count, total, latest = get_transaction_stats()
+            last_id = get_last_transaction_id()
+            newest = query_transactions(order_by='id DESC', limit=NEW_ROWS_LIMIT)
+            sync = {'last_id': last_id, 'count': count, 'total': total, 'latest': latest, 'shown': len(newest)}
+            table = newest
+        else:
+            # The browser already holds the older rows; only send the new ones
+            shown = sync['shown'] + len(rows)
+            table = Patch()
+            for row in rows:
+                table.prepend(row)
+            for index in range(shown - 1, NEW_ROWS_LIMIT - 1, -1):
+                del table[index]
+            sync = {'last_id': rows[-1]['id'],
+                    'count': sync['count'] + len(rows),
+                    'total': sync['total'] + sum(row['Amount'] for row in rows),
+                    'latest': max([sync['latest'] if sync['count'] else '', *(row['Date'] for row in rows)]),
+                    'shown': min(shown, NEW_ROWS_LIMIT)}
+        return sync, table, f"{sync['count']:,}", f"${sync['total']:,.2f}", str(sync['latest']).split()[0]
+
+    @app.callback(
         Output('transaction-msg', 'children'),
         Output('transaction-msg', 'style'),
         Output('url', 'pathname'),
@@ -378,13 +541,13 @@ def register_callbacks(app):
             if all([date, ccp, ccs, sow, po, amount, category, type_]):
                 try:
                     add_transaction(date, ccp, ccs, sow, po, amount, category, type_)
+                    notify_write()
                     msg = '✓ Transaction added successfully!'
                     msg_style.update({
                         'backgroundColor': f'{COLORS["success"]}20',
                         'color': COLORS['success']
                     })
-                    df = get_transactions_df()
-                    return df.to_dict('records'), msg, msg_style, '/'
+                    return msg, msg_style, '/'
                 except Exception as e:
                     msg = f'⚠ Error: {str(e)}'
                     msg_style.update({
@@ -398,5 +561,41 @@ def register_callbacks(app):
                     'color': COLORS['warning']
                 })
         
-        df = get_transactions_df()
-        return df.to_dict('records'), msg, msg_style, '/transactions'
+        return msg, msg_style, '/transactions'
+
+    @app.callback(
+        Output('transactions-table', 'page_current', allow_duplicate=True),
+        Output('import-msg', 'children'),
+        Input('import-upload', 'contents'),
+        State('import-upload', 'filename'),
+        prevent_initial_call=True,
+        # Large files import in a separate process when diskcache is installed
+        **background_callback(running=[(Output('import-upload', 'disabled'), True, False)])
+    )
+    def import_upload_callback(contents, filename):
+        if not contents:
+            return no_update, ''
+        fmt = 'parquet' if (filename or '').lower().endswith('.parquet') else 'csv'
+        try:
+            encoded = contents.split(',', 1)[1]
+            # May run in a background process, so no notify_write(): the server's
+            # warming thread sees the data version move on its next check
+            report = import_transactions(io.BytesIO(base64.b64decode(encoded)), fmt)
+        except Exception as e:
+            return no_update, html.Div(f'⚠ Import failed: {str(e)}', style={'color': COLORS['danger']})
+        msg = [html.Div(f'✓ {format_report(report)}', style={'color': COLORS['success'], 'fontWeight': '500'})]
+        msg += [html.Div(f'Row {row}: {error}', style={'color': COLORS['danger']})
+                for row, error in report['errors'][:10]]
+        if report['rejected'] > 10:
+            msg.append(html.Div(f"... and {report['rejected'] - 10:,} more rejected rows"))
+        # Jumping back to the first page re-runs the paged query
+        return 0, msg
+
+    # Keep the export link in sync with what the table is showing
+    @app.callback(
+        Output('download-link', 'href'),
+        Input('transactions-table', 'filter_query'),
+        Input('transactions-table', 'sort_by')
+    )
+    def update_export_link(filter_query, sort_by):
+        return export_url(filter_query, sort_by)
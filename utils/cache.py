@@ -0,0 +1,121 @@
+"""In-process caches for values derived from the ledger.
+
+Entries are keyed by the database data version (see utils.db), so any write
+makes older entries unreachable; LRU and TTL eviction bound the memory they
+hold until then.
+"""
+import functools
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from utils.db import get_data_version
+
+class AggregateCache:
+    """Thread-safe LRU cache with an optional time-to-live and hit/miss counters.
+
+    `sizeof`, when given, measures each value so stats() can report the bytes
+    held; compute time is tracked for values built through get_or_compute()."""
+
+    def __init__(self, maxsize=64, ttl=None, sizeof=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        self.builds = 0
+        self.build_seconds = 0.0
+        self.last_build_seconds = 0.0
+
+    def _size(self, value):
+        return self.sizeof(value) if self.sizeof else 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                if self.ttl is None or time.monotonic() - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.bytes -= self._size(value)
+                self.evictions += 1
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= self._size(previous[0])
+            self._entries[key] = (value, time.monotonic())
+            self.bytes += self._size(value)
+            while len(self._entries) > self.maxsize:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self.bytes -= self._size(evicted)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        # Compute outside the lock: concurrent misses may both compute, but
+        # a slow aggregation never blocks readers of other keys.
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            started = time.perf_counter()
+            value = compute()
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.builds += 1
+                self.build_seconds += elapsed
+                self.last_build_seconds = elapsed
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'bytes': self.bytes,
+                'builds': self.builds,
+                'build_seconds': self.build_seconds,
+                'avg_build_ms': 1000 * self.build_seconds / self.builds if self.builds else 0.0,
+                'last_build_ms': 1000 * self.last_build_seconds,
+            }
+
+# Dashboard KPIs, YTD series and monthly splits; the TTL only matters for
+# edits made outside the app that do not bump the data version.
+aggregate_cache = AggregateCache(maxsize=32, ttl=300)
+
+# Plotly figures as parsed JSON dicts, keyed the same way; sized by encoded length
+figure_cache = AggregateCache(maxsize=32, ttl=300,
+                              sizeof=lambda value: sum(len(json.dumps(part)) for part in value))
+
+def cached_by_data_version(cache):
+    """Decorator caching a function's result per (data version, arguments).
+
+    Cached values are shared between callers and must be treated as read-only."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args):
+            key = (func.__qualname__, get_data_version(), args)
+            return cache.get_or_compute(key, lambda: func(*args))
+        return wrapper
+    return decorator
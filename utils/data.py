@@ -1,17 +1,81 @@
-import pandas as pd
+"""Synthetic ledgers for demos and benchmarks.
+
+Rows are generated column-wise with NumPy, chunk by chunk, so a million-row
+scratch database can be populated without holding it all in memory:
+
+    TEAMPOWER_DB=/tmp/scratch.db python -m utils.data --rows 1000000 --years 2024 2025
+"""
+import argparse
+
 import numpy as np
+import pandas as pd
+
+from utils.db import CATEGORIES, TYPES, add_transactions, init_db
+
+SOWS_PER_CENTER = 5
+POS_PER_SOW = 4
+CHUNK_SIZE = 50_000
+
+def _center_weights(cost_centers, skew):
+    """Zipf-like popularity: skew 0 spreads rows evenly, larger values pile
+    them onto the first few cost centers."""
+    weights = 1.0 / np.arange(1, cost_centers + 1) ** skew
+    return weights / weights.sum()
+
+def generate_columns(rows, years=(2025,), cost_centers=3, skew=0.0, seed=42):
+    """Dict of NumPy columns for `rows` transactions, amounts in cents.
+
+    SOW numbers belong to one cost center and POs to one SOW, so the
+    project -> SOW -> PO drill-down sees a real hierarchy."""
+    rng = np.random.default_rng(seed)
+    days = np.concatenate([np.arange(f'{year}-01-01', f'{year + 1}-01-01', dtype='datetime64[D]')
+                           for year in sorted(years)])
+    centers = rng.choice(cost_centers, rows, p=_center_weights(cost_centers, skew))
+    sows = centers * SOWS_PER_CENTER + rng.integers(0, SOWS_PER_CENTER, rows)
+    pos = sows * POS_PER_SOW + rng.integers(0, POS_PER_SOW, rows)
+    return {
+        'Date': rng.choice(days, rows),
+        'Cost Center Project': np.char.add('CCP', (centers + 1).astype(str)),
+        'Cost Center SOW': np.char.add('CCS', (sows % 2 + 1).astype(str)),
+        'SOW Number': (1000 + sows).astype(str),
+        'PO': (2000 + pos).astype(str),
+        'Amount': rng.integers(100_000, 1_000_000, rows),
+        'Category': rng.choice(CATEGORIES, rows),
+        'Type': rng.choice(TYPES, rows),
+    }
+
+def get_dummy_data(rows=50, years=(2025,), cost_centers=3, skew=0.0, seed=42):
+    """Synthetic ledger as a DataFrame in display columns, amounts in currency units."""
+    columns = generate_columns(rows, years, cost_centers, skew, seed)
+    columns['Date'] = pd.to_datetime(columns['Date'])
+    columns['Amount'] = columns['Amount'] / 100.0
+    return pd.DataFrame(columns)
+
+def iter_rows(rows, years=(2025,), cost_centers=3, skew=0.0, seed=42, chunk_size=CHUNK_SIZE):
+    """Yield lists of add_transactions tuples, chunk_size rows at a time."""
+    for chunk, offset in enumerate(range(0, rows, chunk_size)):
+        columns = generate_columns(min(chunk_size, rows - offset), years, cost_centers, skew, seed + chunk)
+        columns['Date'] = np.datetime_as_string(columns['Date'], unit='D')
+        yield list(zip(columns['Date'].tolist(), columns['Cost Center Project'].tolist(),
+                       columns['Cost Center SOW'].tolist(), columns['SOW Number'].tolist(),
+                       columns['PO'].tolist(), columns['Amount'].tolist(),
+                       columns['Category'].tolist(), columns['Type'].tolist()))
+
+def populate_db(rows, years=(2025,), cost_centers=3, skew=0.0, seed=42, chunk_size=CHUNK_SIZE):
+    """Add `rows` synthetic transactions to the current database (utils.db.DB_PATH)."""
+    init_db()
+    return add_transactions(iter_rows(rows, years, cost_centers, skew, seed, chunk_size))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Populate the database (TEAMPOWER_DB) with synthetic transactions.')
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--years', type=int, nargs='+', default=[2025])
+    parser.add_argument('--cost-centers', type=int, default=3)
+    parser.add_argument('--skew', type=float, default=0.0, help='0 = even spread across cost centers')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+    inserted = populate_db(args.rows, args.years, args.cost_centers, args.skew, args.seed)
+    print(f'Inserted {inserted:,} transactions')
 
-def get_dummy_data():
-    np.random.seed(42)
-    months = pd.date_range('2025-01-01', periods=8, freq='M')
-    df = pd.DataFrame({
-        'Date': np.random.choice(months, 50),
-        'Cost Center Project': np.random.choice(['CCP1', 'CCP2', 'CCP3'], 50),
-        'Cost Center SOW': np.random.choice(['CCS1', 'CCS2'], 50),
-        'SOW Number': np.random.randint(1000, 1100, 50),
-        'PO': np.random.randint(2000, 2100, 50),
-        'Amount': np.random.randint(1000, 10000, 50),
-        'Category': np.random.choice(['Budget', 'Planned', 'Consumed'], 50),
-        'Type': np.random.choice(['OPEX', 'CAPEX'], 50)
-    })
-    return df
+if __name__ == '__main__':
+    main()
@@ -1,82 +1,770 @@
+import functools
+import inspect
+import os
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from decimal import Decimal, ROUND_HALF_UP
 from pathlib import Path
 
-DB_PATH = Path(__file__).parent.parent / 'team_power.db'
+# TEAMPOWER_DB points a process at another database file, e.g. a scratch
+# ledger generated by utils.data for benchmarks
+DB_PATH = Path(os.environ.get('TEAMPOWER_DB') or Path(__file__).parent.parent / 'team_power.db')
+
+CATEGORIES = ['Budget', 'Planned', 'Consumed']
+TYPES = ['OPEX', 'CAPEX']
+
+# --- Connection management ---
+# One long-lived connection per thread: Dash serves callbacks from a pool of
+# worker threads, and sqlite3 connections must not be shared across threads.
+PRAGMAS = (
+    ('journal_mode', 'WAL'),       # readers never block the writer
+    ('synchronous', 'NORMAL'),     # safe with WAL, one fsync per checkpoint
+    ('cache_size', -16000),        # ~16 MB page cache per connection
+    ('mmap_size', 268435456),      # map up to 256 MB of the file
+    ('temp_store', 'MEMORY'),
+)
+BUSY_TIMEOUT = 30
+
+_local = threading.local()
+_inherited = []  # connections copied in by fork(), see _own_connection()
+_stats_lock = threading.Lock()
+_stats = {'opened': 0, 'reused': 0, 'reconnected': 0, 'closed': 0}
+
+def _bump(counter):
+    with _stats_lock:
+        _stats[counter] += 1
+
+def _open_connection():
+    conn = sqlite3.connect(DB_PATH, timeout=BUSY_TIMEOUT)
+    for name, value in PRAGMAS:
+        conn.execute(f'PRAGMA {name}={value}')
+    _bump('opened')
+    return conn
+
+def _is_healthy(conn):
+    try:
+        conn.total_changes  # raises ProgrammingError once the connection is closed
+        return True
+    except sqlite3.ProgrammingError:
+        return False
+
+def _own_connection():
+    """This thread's connection, if it was opened by this process.
+
+    A child started with fork() (Dash background callbacks, a preloading
+    server's workers) inherits the forking thread's connection. SQLite must
+    not use it across fork(), not even to close it, so it is set aside
+    untouched, and kept referenced so garbage collection never closes it."""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and _local.pid != os.getpid():
+        _inherited.append(conn)
+        conn = _local.conn = None
+    return conn
+
+def get_connection():
+    """Return this thread's connection, opening (or reopening) it if needed."""
+    conn = _own_connection()
+    if conn is not None:
+        if _local.path == DB_PATH and _is_healthy(conn):
+            _bump('reused')
+            return conn
+        _bump('reconnected')
+        close_connection()
+    conn = _open_connection()
+    _local.conn = conn
+    _local.path = DB_PATH
+    _local.pid = os.getpid()
+    return conn
+
+def close_connection():
+    """Close this thread's connection, if any."""
+    conn = _own_connection()
+    if conn is not None:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        _local.conn = None
+        _bump('closed')
+
+def check_wal_mode():
+    """Raise unless the database is in WAL mode, which concurrent workers rely on
+    so readers do not block on the writer (some network filesystems refuse it)."""
+    mode = get_connection().execute('PRAGMA journal_mode').fetchone()[0]
+    if mode.lower() != 'wal':
+        raise Exception(f"Database {DB_PATH} is in {mode} journal mode, expected WAL")
+    return mode
+
+def connection_stats():
+    """Snapshot of the connection counters, for health checks and tuning."""
+    with _stats_lock:
+        stats = dict(_stats)
+    total = stats['opened'] + stats['reused']
+    stats['reuse_ratio'] = stats['reused'] / total if total else 0.0
+    return stats
+
+# --- Query observers ---
+# Callables run after every public query below as observer(name, seconds, rows);
+# utils.instrumentation registers one. With none registered a query only pays
+# an empty-list check.
+QUERY_OBSERVERS = []
+
+def _row_count(result):
+    return len(result) if isinstance(result, (list, dict)) or hasattr(result, 'columns') else None
+
+def _notify(name, seconds, rows):
+    for observer in QUERY_OBSERVERS:
+        observer(name, seconds, rows)
+
+def observed(func):
+    """Report each call of a query function to QUERY_OBSERVERS. For generators
+    only the time spent producing batches counts, not the consumer's."""
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            if not QUERY_OBSERVERS:
+                yield from func(*args, **kwargs)
+                return
+            batches, seconds, rows = func(*args, **kwargs), 0.0, 0
+            try:
+                while True:
+                    started = time.perf_counter()
+                    try:
+                        batch = next(batches)
+                    except StopIteration:
+                        break
+                    finally:
+                        seconds += time.perf_counter() - started
+                    rows += len(batch)
+                    yield batch
+            finally:
+                _notify(func.__name__, seconds, rows)
+        return generator_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not QUERY_OBSERVERS:
+            return func(*args, **kwargs)
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        _notify(func.__name__, time.perf_counter() - started, _row_count(result))
+        return result
+    return wrapper
+
+# --- Schema migrations ---
+# Each entry moves the schema up one version. PRAGMA user_version records the
+# last applied version, so startup only runs what is missing and a current
+# database costs a single pragma read.
+MIGRATIONS = [
+    (1, 'create transactions table', [
+        '''CREATE TABLE IF NOT EXISTS transactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT,
+            cost_center_project TEXT,
+            cost_center_sow TEXT,
+            sow_number TEXT,
+            po TEXT,
+            amount REAL,
+            category TEXT,
+            type TEXT
+        )''',
+    ]),
+    (2, 'store amounts as integer cents and enforce ISO dates', [
+        '''CREATE TABLE transactions_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT NOT NULL CHECK (date IS date(date)),
+            cost_center_project TEXT,
+            cost_center_sow TEXT,
+            sow_number TEXT,
+            po TEXT,
+            amount_cents INTEGER NOT NULL,
+            category TEXT,
+            type TEXT
+        )''',
+        '''INSERT INTO transactions_new (id, date, cost_center_project, cost_center_sow,
+                                       sow_number, po, amount_cents, category, type)
+           SELECT id, date(date), cost_center_project, cost_center_sow,
+                  sow_number, po, CAST(ROUND(COALESCE(amount, 0) * 100) AS INTEGER), category, type
+           FROM transactions''',
+        'DROP TABLE transactions',
+        'ALTER TABLE transactions_new RENAME TO transactions',
+    ]),
+    (3, 'index the dashboard and ledger filters', [
+        'CREATE INDEX IF NOT EXISTS idx_transactions_category_date ON transactions (category, date)',
+        'CREATE INDEX IF NOT EXISTS idx_transactions_type_date ON transactions (type, date)',
+        'CREATE INDEX IF NOT EXISTS idx_transactions_ccp_date ON transactions (cost_center_project, date)',
+        'CREATE INDEX IF NOT EXISTS idx_transactions_sow ON transactions (sow_number)',
+    ]),
+    (4, 'track a data version for cache invalidation', [
+        'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)',
+        "INSERT OR IGNORE INTO meta (key, value) VALUES ('data_version', 0)",
+    ]),
+    (5, 'materialise a daily summary maintained by triggers', [
+        '''CREATE TABLE IF NOT EXISTS daily_summary (
+            date TEXT NOT NULL,
+            category TEXT NOT NULL,
+            type TEXT NOT NULL,
+            cost_center_project TEXT NOT NULL,
+            amount_cents INTEGER NOT NULL,
+            row_count INTEGER NOT NULL,
+            PRIMARY KEY (date, category, type, cost_center_project)
+        ) WITHOUT ROWID''',
+        '''INSERT INTO daily_summary (date, category, type, cost_center_project, amount_cents, row_count)
+           SELECT date, COALESCE(category, ''), COALESCE(type, ''), COALESCE(cost_center_project, ''),
+                  SUM(amount_cents), COUNT(*)
+           FROM transactions
+           GROUP BY 1, 2, 3, 4''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_daily_summary_insert AFTER INSERT ON transactions BEGIN
+            INSERT INTO daily_summary (date, category, type, cost_center_project, amount_cents, row_count)
+            VALUES (NEW.date, COALESCE(NEW.category, ''), COALESCE(NEW.type, ''),
+                    COALESCE(NEW.cost_center_project, ''), NEW.amount_cents, 1)
+            ON CONFLICT (date, category, type, cost_center_project) DO UPDATE SET
+                amount_cents = amount_cents + excluded.amount_cents,
+                row_count = row_count + 1;
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_daily_summary_delete AFTER DELETE ON transactions BEGIN
+            UPDATE daily_summary
+            SET amount_cents = amount_cents - OLD.amount_cents, row_count = row_count - 1
+            WHERE date = OLD.date AND category = COALESCE(OLD.category, '')
+              AND type = COALESCE(OLD.type, '') AND cost_center_project = COALESCE(OLD.cost_center_project, '');
+            DELETE FROM daily_summary
+            WHERE date = OLD.date AND category = COALESCE(OLD.category, '')
+              AND type = COALESCE(OLD.type, '') AND cost_center_project = COALESCE(OLD.cost_center_project, '')
+              AND row_count <= 0;
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_daily_summary_update
+           AFTER UPDATE OF date, category, type, cost_center_project, amount_cents ON transactions BEGIN
+            UPDATE daily_summary
+            SET amount_cents = amount_cents - OLD.amount_cents, row_count = row_count - 1
+            WHERE date = OLD.date AND category = COALESCE(OLD.category, '')
+              AND type = COALESCE(OLD.type, '') AND cost_center_project = COALESCE(OLD.cost_center_project, '');
+            DELETE FROM daily_summary
+            WHERE date = OLD.date AND category = COALESCE(OLD.category, '')
+              AND type = COALESCE(OLD.type, '') AND cost_center_project = COALESCE(OLD.cost_center_project, '')
+              AND row_count <= 0;
+            INSERT INTO daily_summary (date, category, type, cost_center_project, amount_cents, row_count)
+            VALUES (NEW.date, COALESCE(NEW.category, ''), COALESCE(NEW.type, ''),
+                    COALESCE(NEW.cost_center_project, ''), NEW.amount_cents, 1)
+            ON CONFLICT (date, category, type, cost_center_project) DO UPDATE SET
+                amount_cents = amount_cents + excluded.amount_cents,
+                row_count = row_count + 1;
+        END''',
+    ]),
+    (6, 'server-side login sessions', [
+        '''CREATE TABLE IF NOT EXISTS sessions (
+            token_hash TEXT PRIMARY KEY,
+            username TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            expires_at REAL NOT NULL
+        )''',
+        'CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions (expires_at)',
+    ]),
+    (7, 'roll up totals by project, SOW and PO for the drill-down', [
+        # Primary key order is the drill order, so every level is a range scan
+        '''CREATE TABLE IF NOT EXISTS cost_center_rollup (
+            cost_center_project TEXT NOT NULL,
+            sow_number TEXT NOT NULL,
+            po TEXT NOT NULL,
+            category TEXT NOT NULL,
+            amount_cents INTEGER NOT NULL,
+            row_count INTEGER NOT NULL,
+            PRIMARY KEY (cost_center_project, sow_number, po, category)
+        ) WITHOUT ROWID''',
+        '''INSERT INTO cost_center_rollup (cost_center_project, sow_number, po, category, amount_cents, row_count)
+           SELECT COALESCE(cost_center_project, ''), COALESCE(sow_number, ''), COALESCE(po, ''),
+                  COALESCE(category, ''), SUM(amount_cents), COUNT(*)
+           FROM transactions
+           GROUP BY 1, 2, 3, 4''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_cost_center_rollup_insert AFTER INSERT ON transactions BEGIN
+            INSERT INTO cost_center_rollup (cost_center_project, sow_number, po, category, amount_cents, row_count)
+            VALUES (COALESCE(NEW.cost_center_project, ''), COALESCE(NEW.sow_number, ''),
+                    COALESCE(NEW.po, ''), COALESCE(NEW.category, ''), NEW.amount_cents, 1)
+            ON CONFLICT (cost_center_project, sow_number, po, category) DO UPDATE SET
+                amount_cents = amount_cents + excluded.amount_cents,
+                row_count = row_count + 1;
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_cost_center_rollup_delete AFTER DELETE ON transactions BEGIN
+            UPDATE cost_center_rollup
+            SET amount_cents = amount_cents - OLD.amount_cents, row_count = row_count - 1
+            WHERE cost_center_project = COALESCE(OLD.cost_center_project, '') AND sow_number = COALESCE(OLD.sow_number, '')
+              AND po = COALESCE(OLD.po, '') AND category = COALESCE(OLD.category, '');
+            DELETE FROM cost_center_rollup
+            WHERE cost_center_project = COALESCE(OLD.cost_center_project, '') AND sow_number = COALESCE(OLD.sow_number, '')
+              AND po = COALESCE(OLD.po, '') AND category = COALESCE(OLD.category, '')
+              AND row_count <= 0;
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_cost_center_rollup_update
+           AFTER UPDATE OF cost_center_project, sow_number, po, category, amount_cents ON transactions BEGIN
+            UPDATE cost_center_rollup
+            SET amount_cents = amount_cents - OLD.amount_cents, row_count = row_count - 1
+            WHERE cost_center_project = COALESCE(OLD.cost_center_project, '') AND sow_number = COALESCE(OLD.sow_number, '')
+              AND po = COALESCE(OLD.po, '') AND category = COALESCE(OLD.category, '');
+            DELETE FROM cost_center_rollup
+            WHERE cost_center_project = COALESCE(OLD.cost_center_project, '') AND sow_number = COALESCE(OLD.sow_number, '')
+              AND po = COALESCE(OLD.po, '') AND category = COALESCE(OLD.category, '')
+              AND row_count <= 0;
+            INSERT INTO cost_center_rollup (cost_center_project, sow_number, po, category, amount_cents, row_count)
+            VALUES (COALESCE(NEW.cost_center_project, ''), COALESCE(NEW.sow_number, ''),
+                    COALESCE(NEW.po, ''), COALESCE(NEW.category, ''), NEW.amount_cents, 1)
+            ON CONFLICT (cost_center_project, sow_number, po, category) DO UPDATE SET
+                amount_cents = amount_cents + excluded.amount_cents,
+                row_count = row_count + 1;
+        END''',
+        # Transactions behind one PO, listed at the bottom of the drill-down
+        'CREATE INDEX IF NOT EXISTS idx_transactions_ccp_sow_po ON transactions (cost_center_project, sow_number, po)',
+    ]),
+    (8, 'user accounts and roles', [
+        '''CREATE TABLE IF NOT EXISTS users (
+            username TEXT PRIMARY KEY,
+            password_hash TEXT NOT NULL,
+            role TEXT NOT NULL CHECK (role IN ('user', 'admin'))
+        )''',
+        # The accounts utils.users used to hard-code, with the same passwords
+        '''INSERT OR IGNORE INTO users (username, password_hash, role) VALUES
+            ('admin', 'pbkdf2_sha256$600000$71439b5e56c1adaf143682467931b7b8$84bef2a4e175e5287ecf3a7155fc1f9dc3b5b7f36ca4937eab37b422260d39ca', 'admin'),
+            ('user1', 'pbkdf2_sha256$600000$5f93b0a603d10a7cb730c015a4932798$aa99aa2b4a622c8cfb9b77f9a8b07d73aefa08daa63bb096df01d51a2f39178b', 'user')''',
+    ]),
+    (9, 'count edits and deletes for the ledger snapshot', [
+        "INSERT OR IGNORE INTO meta (key, value) VALUES ('edit_version', 0)",
+        '''CREATE TRIGGER IF NOT EXISTS trg_transactions_edit_update AFTER UPDATE ON transactions BEGIN
+            UPDATE meta SET value = value + 1 WHERE key IN ('edit_version', 'data_version');
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_transactions_edit_delete AFTER DELETE ON transactions BEGIN
+            UPDATE meta SET value = value + 1 WHERE key IN ('edit_version', 'data_version');
+        END''',
+    ]),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def get_schema_version(conn=None):
+    conn = conn or get_connection()
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def migrate():
+    """Apply pending migrations in one transaction; returns the schema version."""
+    conn = get_connection()
+    if get_schema_version(conn) >= SCHEMA_VERSION:
+        return SCHEMA_VERSION
+    try:
+        # Take the write lock first so concurrent workers migrate only once
+        conn.execute('BEGIN IMMEDIATE')
+        current = get_schema_version(conn)
+        for version, _description, statements in MIGRATIONS:
+            if version <= current:
+                continue
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f'PRAGMA user_version = {version}')
+        conn.commit()
+    except sqlite3.Error as e:
+        conn.rollback()
+        raise Exception(f"Migration error: {e}")
+    return get_schema_version(conn)
 
 # --- Database initialization ---
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('''CREATE TABLE IF NOT EXISTS transactions (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        date TEXT,
-        cost_center_project TEXT,
-        cost_center_sow TEXT,
-        sow_number TEXT,
-        po TEXT,
-        amount REAL,
-        category TEXT,
-        type TEXT
-    )''')
-    conn.commit()
-    conn.close()
+    migrate()
+
+# --- Data version ---
+# Bumped in the same transaction as every write (by the append functions
+# below, and by triggers for UPDATE and DELETE), so any process can tell
+# whether ledger-derived caches are still current with a single lookup.
+def _bump_data_version(conn):
+    conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'data_version'")
+
+def _meta_value(key):
+    try:
+        row = get_connection().execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+    except sqlite3.Error as e:
+        raise Exception(f"Database error: {e}")
+    return row[0] if row else 0
+
+@observed
+def get_data_version():
+    return _meta_value('data_version')
+
+@observed
+def get_edit_version():
+    """Number of transaction rows updated or deleted so far, counted by triggers
+    whatever made the change. Appends leave it alone, so while it holds still
+    the rows up to any id are exactly as they were."""
+    return _meta_value('edit_version')
+
+@contextmanager
+def read_transaction():
+    """Run several reads against one consistent view of the database; with WAL,
+    writers committing meanwhile are not seen until the block ends."""
+    conn = get_connection()
+    try:
+        conn.execute('BEGIN')
+    except sqlite3.Error as e:
+        raise Exception(f"Database error: {e}")
+    try:
+        yield conn
+    finally:
+        conn.commit()
 
 # --- CRUD Operations ---
+def to_cents(amount):
+    """Convert a user-entered amount to integer cents, rounding half up."""
+    return int((Decimal(str(amount)) * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+@observed
 def add_transaction(date, ccp, ccs, sow, po, amount, category, type_):
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute('''INSERT INTO transactions (date, cost_center_project, cost_center_sow, sow_number, po, amount, category, type)
-                     VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
-                  (date, ccp, ccs, sow, po, amount, category, type_))
+        conn = get_connection()
+        with conn:
+            conn.execute('''INSERT INTO transactions (date, cost_center_project, cost_center_sow, sow_number, po, amount_cents, category, type)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+                         (date, ccp, ccs, sow, po, to_cents(amount), category, type_))
+            _bump_data_version(conn)
+    except sqlite3.Error as e:
+        raise Exception(f"Database error: {e}")
+
+@observed
+def add_transactions(batches):
+    """Insert batches of (date, ccp, ccs, sow, po, amount_cents, category, type)
+    tuples with executemany inside a single transaction; returns the row count."""
+    conn = get_connection()
+    inserted = 0
+    try:
+        conn.execute('BEGIN')
+        for batch in batches:
+            conn.executemany('''INSERT INTO transactions (date, cost_center_project, cost_center_sow, sow_number, po, amount_cents, category, type)
+                                VALUES (?, ?, ?, ?, ?, ?, ?, ?)''', batch)
+            inserted += len(batch)
+        if inserted:
+            _bump_data_version(conn)
         conn.commit()
     except sqlite3.Error as e:
+        conn.rollback()
         raise Exception(f"Database error: {e}")
-    finally:
-        conn.close()
+    except Exception:
+        conn.rollback()
+        raise
+    return inserted
 
+@observed
 def get_transactions():
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute('SELECT * FROM transactions')
-        rows = c.fetchall()
+        conn = get_connection()
+        rows = conn.execute('''SELECT id, date, cost_center_project, cost_center_sow, sow_number, po,
+                                      amount_cents / 100.0, category, type
+                               FROM transactions''').fetchall()
         # Use correct column names matching the database fields
-        columns = ['id', 'date', 'cost_center_project', 'cost_center_sow', 
+        columns = ['id', 'date', 'cost_center_project', 'cost_center_sow',
                   'sow_number', 'po', 'amount', 'category', 'type']
         return [dict(zip(columns, row)) for row in rows]
     except sqlite3.Error as e:
         raise Exception(f"Database error: {e}")
-    finally:
-        conn.close()
 
-# --- Utility for dashboard KPIs ---
-def get_transactions_df():
+# --- Streaming reads ---
+# Display name -> SQL expression, in the column order used by tables and exports
+DISPLAY_COLUMNS = {
+    'Date': 'date',
+    'Cost Center Project': 'cost_center_project',
+    'Cost Center SOW': 'cost_center_sow',
+    'SOW Number': 'sow_number',
+    'PO': 'po',
+    'Amount': 'amount_cents / 100.0',
+    'Category': 'category',
+    'Type': 'type',
+}
+FETCH_SIZE = 5000
+
+@observed
+def iter_transactions(where='', params=(), order_by='id', batch_size=FETCH_SIZE):
+    """Yield lists of display-ordered row tuples, batch_size rows at a time.
+
+    `where` is a ready-made ' WHERE ...' clause (see utils.filters), so the
+    caller never holds more than one batch in memory."""
+    sql = f"SELECT {', '.join(DISPLAY_COLUMNS.values())} FROM transactions{where} ORDER BY {order_by}"
+    try:
+        cursor = get_connection().execute(sql, list(params))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+    except sqlite3.Error as e:
+        raise Exception(f"Database error: {e}")
+
+# --- Paged reads ---
+@observed
+def query_transactions(where='', params=(), order_by='id', limit=10, offset=0):
+    """One page of transactions as display-named records (plus 'id')."""
+    sql = (f"SELECT id, {', '.join(DISPLAY_COLUMNS.values())} FROM transactions{where} "
+           f"ORDER BY {order_by} LIMIT ? OFFSET ?")
+    try:
+        rows = get_connection().execute(sql, [*params, limit, offset]).fetchall()
+    except sqlite3.Error as e:
+        raise Exception(f"Database error: {e}")
+    columns = ['id', *DISPLAY_COLUMNS]
+    return [dict(zip(columns, row)) for row in rows]
+
+@observed
+def get_transactions_since(last_id, limit=None):
+    """Display-named records (plus 'id') of transactions with id > last_id,
+    oldest first. A primary-key range scan, so the cost follows the number of
+    new rows rather than the size of the ledger."""
+    sql = f"SELECT id, {', '.join(DISPLAY_COLUMNS.values())} FROM transactions WHERE id > ? ORDER BY id"
+    params = [last_id or 0]
+    if limit is not None:
+        sql += ' LIMIT ?'
+        params.append(limit)
+    try:
+        rows = get_connection().execute(sql, params).fetchall()
+    except sqlite3.Error as e:
+        raise Exception(f"Database error: {e}")
+    columns = ['id', *DISPLAY_COLUMNS]
+    return [dict(zip(columns, row)) for row in rows]
+
+@observed
+def get_last_transaction_id():
+    try:
+        return get_connection().execute('SELECT COALESCE(MAX(id), 0) FROM transactions').fetchone()[0]
+    except sqlite3.Error as e:
+        raise Exception(f"Database error: {e}")
+
+@observed
+def count_transactions(where='', params=()):
+    try:
+        return get_connection().execute(f'SELECT COUNT(*) FROM transactions{where}', list(params)).fetchone()[0]
+    except sqlite3.Error as e:
+        raise Exception(f"Database error: {e}")
+
+@observed
+def get_transaction_stats():
+    """(row count, total amount, latest date) for the whole ledger."""
+    try:
+        count, total, latest = get_connection().execute(
+            'SELECT COUNT(*), COALESCE(SUM(amount_cents), 0) / 100.0, MAX(date) FROM transactions').fetchone()
+    except sqlite3.Error as e:
+        raise Exception(f"Database error: {e}")
+    return count, total, latest
+
+# --- Aggregations ---
+# GROUP BY runs inside SQLite over daily_summary (one row per day x category x
+# type x cost center, kept current by triggers), so callers only receive the
+# small result sets and the cost scales with days rather than transactions.
+def _iso_date(value):
+    return value.strftime('%Y-%m-%d') if hasattr(value, 'strftime') else str(value)
+
+def _date_filter(start=None, end=None):
+    clauses, params = [], []
+    if start is not None:
+        clauses.append('date >= ?')
+        params.append(_iso_date(start))
+    if end is not None:
+        clauses.append('date <= ?')
+        params.append(_iso_date(end))
+    where = ' WHERE ' + ' AND '.join(clauses) if clauses else ''
+    return where, params
+
+def _aggregate(sql, start=None, end=None):
+    where, params = _date_filter(start, end)
+    try:
+        return get_connection().execute(sql.format(where=where), params).fetchall()
+    except sqlite3.Error as e:
+        raise Exception(f"Database error: {e}")
+
+@observed
+def get_category_totals(start=None, end=None):
+    """Total amount per category, e.g. {'Budget': 1200.0, 'Consumed': 300.0}."""
+    rows = _aggregate('SELECT category, SUM(amount_cents) / 100.0 FROM daily_summary{where} GROUP BY category',
+                      start, end)
+    return {category: total for category, total in rows}
+
+@observed
+def get_daily_category_sums(start=None, end=None):
+    """(date, category, total) rows ordered by date."""
+    return _aggregate('SELECT date, category, SUM(amount_cents) / 100.0 FROM daily_summary{where} '
+                      'GROUP BY date, category ORDER BY date', start, end)
+
+@observed
+def get_daily_summary(start=None, end=None):
+    """(date, category, type, total) rows ordered by date, summed over cost centers."""
+    return _aggregate('SELECT date, category, type, SUM(amount_cents) / 100.0 FROM daily_summary{where} '
+                      'GROUP BY date, category, type ORDER BY date', start, end)
+
+@observed
+def get_date_bounds():
+    """(first date, last date) present in the ledger as ISO strings, or (None, None)."""
+    return tuple(_aggregate('SELECT MIN(date), MAX(date) FROM daily_summary')[0])
+
+@observed
+def get_monthly_type_sums(start=None, end=None):
+    """(month 'YYYY-MM', type, total) rows ordered by month."""
+    return _aggregate('SELECT substr(date, 1, 7) AS month, type, SUM(amount_cents) / 100.0 FROM daily_summary{where} '
+                      'GROUP BY month, type ORDER BY month', start, end)
+
+@observed
+def get_monthly_cost_center_sums(category, start=None, end=None):
+    """(cost center project, month 'YYYY-MM', total) rows for one category."""
+    where, params = _date_filter(start, end)
+    where += (' AND' if where else ' WHERE') + ' category = ?'
+    try:
+        return get_connection().execute(
+            'SELECT cost_center_project, substr(date, 1, 7) AS month, SUM(amount_cents) / 100.0 '
+            f'FROM daily_summary{where} GROUP BY cost_center_project, month', [*params, category]).fetchall()
+    except sqlite3.Error as e:
+        raise Exception(f"Database error: {e}")
+
+# --- Grouped totals ---
+# Summary views over daily_summary: view name -> (column label, SQL expression)
+SUMMARY_GROUPS = {
+    'cost_center': ('Cost Center Project', 'cost_center_project'),
+    'month': ('Month', 'substr(date, 1, 7)'),
+}
+# Column label -> SQL expression for the per-group totals
+GROUP_TOTAL_COLUMNS = {
+    **{category: f"SUM(CASE WHEN category = '{category}' THEN amount_cents ELSE 0 END) / 100.0"
+       for category in CATEGORIES},
+    'Transactions': 'SUM(row_count)',
+}
+
+def group_total_columns(view):
+    """Column label -> SQL expression for one summary view, group column first."""
+    label, expression = SUMMARY_GROUPS[view]
+    return {label: expression, **GROUP_TOTAL_COLUMNS}
+
+@observed
+def query_group_totals(view, start=None, end=None, order_by=None, limit=10, offset=0):
+    """One page of per-group category totals and transaction counts in [start, end]."""
+    columns = group_total_columns(view)
+    group = next(iter(columns.values()))
+    where, params = _date_filter(start, end)
+    sql = (f"SELECT {', '.join(columns.values())} FROM daily_summary{where} "
+           f"GROUP BY {group} ORDER BY {order_by or group} LIMIT ? OFFSET ?")
+    try:
+        rows = get_connection().execute(sql, [*params, limit, offset]).fetchall()
+    except sqlite3.Error as e:
+        raise Exception(f"Database error: {e}")
+    return [dict(zip(columns, row)) for row in rows]
+
+@observed
+def count_groups(view, start=None, end=None):
+    _, expression = SUMMARY_GROUPS[view]
+    return _aggregate(f'SELECT COUNT(DISTINCT {expression}) FROM daily_summary{{where}}', start, end)[0][0]
+
+@observed
+def get_group_row_counts(view, start=None, end=None):
+    """(group, transaction count) rows for a summary view in [start, end], in group order."""
+    _, expression = SUMMARY_GROUPS[view]
+    return _aggregate(f'SELECT {expression} AS grp, SUM(row_count) FROM daily_summary{{where}} '
+                      'GROUP BY grp ORDER BY grp', start, end)
+
+# --- Cost-center drill-down ---
+# (column label, rollup column) from the top of the hierarchy down
+DRILL_LEVELS = [
+    ('Cost Center Project', 'cost_center_project'),
+    ('SOW Number', 'sow_number'),
+    ('PO', 'po'),
+]
+
+def _drill_filter(path):
+    clauses = [f'{column} = ?' for _, column in DRILL_LEVELS[:len(path)]]
+    where = ' WHERE ' + ' AND '.join(clauses) if clauses else ''
+    return where, list(path)
+
+@observed
+def get_rollup(path=(), limit=10, offset=0):
+    """One page of totals for the children of `path` in the project -> SOW -> PO
+    hierarchy: () lists projects, (project,) its SOWs, (project, sow) its POs."""
+    label, column = DRILL_LEVELS[len(path)]
+    columns = {label: column, **GROUP_TOTAL_COLUMNS}
+    where, params = _drill_filter(path)
+    sql = (f"SELECT {', '.join(columns.values())} FROM cost_center_rollup{where} "
+           f"GROUP BY {column} ORDER BY {column} LIMIT ? OFFSET ?")
+    try:
+        rows = get_connection().execute(sql, [*params, limit, offset]).fetchall()
+    except sqlite3.Error as e:
+        raise Exception(f"Database error: {e}")
+    return [dict(zip(columns, row)) for row in rows]
+
+@observed
+def count_rollup(path=()):
+    _, column = DRILL_LEVELS[len(path)]
+    where, params = _drill_filter(path)
+    try:
+        return get_connection().execute(f'SELECT COUNT(DISTINCT {column}) FROM cost_center_rollup{where}',
+                                        params).fetchone()[0]
+    except sqlite3.Error as e:
+        raise Exception(f"Database error: {e}")
+
+def po_filter(project, sow, po):
+    """(where, params) selecting the transactions behind one rollup PO row.
+
+    The rollup stores NULL keys as '', so a blank key matches both; non-blank
+    keys stay plain equalities that can use idx_transactions_ccp_sow_po."""
+    clauses, params = [], []
+    for (_, column), value in zip(DRILL_LEVELS, (project, sow, po)):
+        if value:
+            clauses.append(f'{column} = ?')
+            params.append(value)
+        else:
+            clauses.append(f"({column} IS NULL OR {column} = '')")
+    return ' WHERE ' + ' AND '.join(clauses), params
+
+# --- Typed DataFrame loader ---
+# Display column -> (SQL expression, kind). Amounts are read as integer cents
+# and dates as ISO text, then converted per chunk into typed NumPy columns.
+FRAME_COLUMNS = {
+    'id': ('id', 'int'),
+    'Date': ('date', 'date'),
+    'Cost Center Project': ('cost_center_project', 'category'),
+    'Cost Center SOW': ('cost_center_sow', 'category'),
+    'SOW Number': ('sow_number', 'category'),
+    'PO': ('po', 'category'),
+    'Amount': ('amount_cents', 'cents'),
+    'Category': ('category', 'category'),
+    'Type': ('type', 'category'),
+}
+
+def _typed_column(values, kind):
+    import numpy as np
+    import pandas as pd
+    if kind == 'date':
+        return np.array(values, dtype='datetime64[D]').astype('datetime64[s]')
+    if kind == 'cents':
+        return np.array(values, dtype=np.int64) / 100.0
+    if kind == 'int':
+        return np.array(values, dtype=np.int64)
+    # Fixed str categories, so a batch of only NULLs still unions with the others
+    return pd.Categorical(pd.array(values, dtype='str'))
+
+@observed
+def get_transactions_df(columns=None, where='', params=(), batch_size=FETCH_SIZE):
+    """Ledger as a typed DataFrame: datetime64 Date, float64 Amount and
+    categorical text columns, holding only `columns` (default: the display
+    columns; 'id' is also available) of the rows matching `where` (see
+    utils.filters).
+
+    Rows are fetched batch_size at a time and each batch is converted straight
+    into typed arrays, so no per-row dicts or object columns are built."""
+    import numpy as np
     import pandas as pd
+    from pandas.api.types import union_categoricals
+    columns = list(columns or DISPLAY_COLUMNS)
+    sql = f"SELECT {', '.join(FRAME_COLUMNS[c][0] for c in columns)} FROM transactions{where} ORDER BY id"
+    chunks = {column: [] for column in columns}
     try:
-        data = get_transactions()
-        if not data:
-            return pd.DataFrame(columns=['Date','Cost Center Project','Cost Center SOW',
-                                      'SOW Number','PO','Amount','Category','Type'])
-        df = pd.DataFrame(data)
-        # Rename columns to display format
-        df = df.rename(columns={
-            'date': 'Date',
-            'cost_center_project': 'Cost Center Project',
-            'cost_center_sow': 'Cost Center SOW',
-            'sow_number': 'SOW Number',
-            'po': 'PO',
-            'amount': 'Amount',
-            'category': 'Category',
-            'type': 'Type'
-        })
-        # Drop the id column as it's not needed for display
-        if 'id' in df.columns:
-            df = df.drop('id', axis=1)
-        return df
-    except Exception as e:
-        # Return empty DataFrame on error
-        return pd.DataFrame(columns=['Date','Cost Center Project','Cost Center SOW',
-                                   'SOW Number','PO','Amount','Category','Type'])
-
-init_db()
+        cursor = get_connection().execute(sql, list(params))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for column, values in zip(columns, zip(*rows)):
+                chunks[column].append(_typed_column(values, FRAME_COLUMNS[column][1]))
+    except sqlite3.Error:
+        # Callers render an empty ledger rather than an error page
+        chunks = {column: [] for column in columns}
+    frame = {}
+    for column, parts in chunks.items():
+        kind = FRAME_COLUMNS[column][1]
+        if not parts:
+            parts = [_typed_column([], kind)]
+        frame[column] = union_categoricals(parts) if kind == 'category' else np.concatenate(parts)
+    return pd.DataFrame(frame, columns=columns)
@@ -0,0 +1,51 @@
+"""Vectorised aggregation engine behind the dashboard charts.
+
+The input is a long frame with Date, Category, Type and Amount columns,
+either raw ledger rows or pre-aggregated daily_summary rows. It is collapsed
+with a single groupby on (day, category, type) using categorical keys, and
+both the daily cumulative matrix and the monthly matrix are derived from
+that one result.
+"""
+import numpy as np
+import pandas as pd
+
+from utils.db import CATEGORIES, TYPES
+
+def collapse(frame, start, end):
+    """Sum Amount per (day, Category, Type) within [start, end]."""
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    dates = pd.to_datetime(frame['Date']).to_numpy(dtype='datetime64[D]')
+    mask = (dates >= start.to_datetime64()) & (dates <= end.to_datetime64())
+    keys = [
+        pd.DatetimeIndex(dates[mask], name='Date'),
+        pd.Categorical(frame['Category'].to_numpy()[mask], categories=CATEGORIES),
+        pd.Categorical(frame['Type'].to_numpy()[mask], categories=TYPES),
+    ]
+    amounts = pd.Series(frame['Amount'].to_numpy(dtype=np.float64)[mask])
+    collapsed = amounts.groupby(keys, observed=True, sort=True).sum()
+    collapsed.index.names = ['Date', 'Category', 'Type']
+    return collapsed
+
+def build_matrices(frame, start, end):
+    """Return (ytd, monthly) for the window [start, end].
+
+    ytd: one row per day, one cumulative column per category present.
+    monthly: one row per 'YYYY-MM' month, OPEX/CAPEX columns, zero-filled.
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    collapsed = collapse(frame, start, end)
+
+    days = pd.date_range(start, end, freq='D')
+    daily = collapsed.groupby(level=['Date', 'Category'], observed=True).sum().unstack('Category')
+    present = [c for c in CATEGORIES if c in daily.columns]
+    ytd = daily.reindex(index=days, columns=present, fill_value=0).fillna(0).cumsum()
+    ytd.columns = pd.Index(present, name='Category')
+
+    months = pd.period_range(start, end, freq='M')
+    periods = collapsed.index.get_level_values('Date').to_period('M')
+    types = collapsed.index.get_level_values('Type')
+    monthly = (collapsed.groupby([periods, types], observed=False).sum()
+               .unstack().reindex(index=months, columns=TYPES, fill_value=0).fillna(0))
+    monthly.index = monthly.index.strftime('%Y-%m')
+    monthly.columns = pd.Index(TYPES, name='Type')
+    return ytd, monthly
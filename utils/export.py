@@ -0,0 +1,54 @@
+"""Streaming CSV export of the transaction ledger.
+
+Rows are pulled from SQLite with fetchmany and written out one chunk at a
+time, so exporting a large ledger keeps memory bounded by FETCH_SIZE rows.
+"""
+import csv
+import io
+import json
+from urllib.parse import urlencode
+
+from utils.db import DISPLAY_COLUMNS, iter_transactions
+from utils.filters import filter_query_to_sql, sort_by_to_sql
+
+EXPORT_PATH = '/export/transactions.csv'
+
+def export_url(filter_query=None, sort_by=None):
+    """Export link carrying the table's current filter and sort."""
+    params = {}
+    if filter_query:
+        params['filter'] = filter_query
+    if sort_by:
+        params['sort'] = json.dumps(sort_by)
+    return f'{EXPORT_PATH}?{urlencode(params)}' if params else EXPORT_PATH
+
+def iter_csv(filter_query=None, sort_by=None):
+    """Yield the CSV text chunk by chunk: the header, then one chunk per fetch."""
+    where, params = filter_query_to_sql(filter_query)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(DISPLAY_COLUMNS.keys())
+    yield buffer.getvalue()
+    for rows in iter_transactions(where, params, sort_by_to_sql(sort_by)):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue()
+
+def register_export_route(server):
+    """Serve EXPORT_PATH from the Flask server as a streamed download."""
+    from flask import Response, request, stream_with_context
+
+    @server.route(EXPORT_PATH)
+    def export_transactions_csv():
+        try:
+            sort_by = json.loads(request.args.get('sort', '[]'))
+        except ValueError:
+            sort_by = []
+        if not isinstance(sort_by, list):
+            sort_by = []
+        return Response(
+            stream_with_context(iter_csv(request.args.get('filter'), sort_by)),
+            mimetype='text/csv',
+            headers={'Content-Disposition': 'attachment; filename=transactions.csv'}
+        )
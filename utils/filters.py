@@ -0,0 +1,95 @@
+"""Translate DataTable filter_query / sort_by into parameterised SQL.
+
+Only columns listed in utils.db.DISPLAY_COLUMNS can be referenced, and every
+value is bound as a parameter, so table input never reaches the SQL text.
+"""
+import re
+
+from utils.db import DISPLAY_COLUMNS
+
+NUMERIC_COLUMNS = {'Amount'}
+
+_CLAUSE_RE = re.compile(r'^\{(?P<column>[^}]+)\}\s+(?P<operator>is blank|is nil|is not blank|\S+)\s*(?P<value>.*)$')
+
+_COMPARISONS = {
+    '=': '=', 'eq': '=',
+    '!=': '!=', 'ne': '!=',
+    '<': '<', 'lt': '<',
+    '<=': '<=', 'le': '<=',
+    '>': '>', 'gt': '>',
+    '>=': '>=', 'ge': '>=',
+}
+
+_CASED_OPERATORS = ('contains', 'eq', 'ne', 'lt', 'le', 'gt', 'ge', 'datestartswith')
+
+def _unquote(value):
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'`':
+        return value[1:-1]
+    return value
+
+def _like_escape(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def _clause(expression, column, operator, value):
+    """SQL for one '{Column} operator value' clause, or None if unsupported."""
+    # DataTable prefixes operators with i/s when filter_options sets the case
+    case = ''
+    if operator[:1] in ('i', 's') and operator[1:] in _CASED_OPERATORS:
+        case, operator = operator[0], operator[1:]
+    insensitive = case == 'i'
+
+    if operator in ('is blank', 'is nil'):
+        return f"({expression} IS NULL OR {expression} = '')", []
+    if operator == 'is not blank':
+        return f"({expression} IS NOT NULL AND {expression} != '')", []
+    if operator == 'contains':
+        if insensitive:
+            return f"{expression} LIKE ? ESCAPE '\\'", [f'%{_like_escape(value)}%']
+        return f'instr({expression}, ?) > 0', [value]
+    if operator == 'datestartswith':
+        return f"{expression} LIKE ? ESCAPE '\\'", [f'{_like_escape(value)}%']
+    if operator in _COMPARISONS:
+        if column in NUMERIC_COLUMNS:
+            try:
+                value = float(value)
+            except ValueError:
+                return None
+        collate = ' COLLATE NOCASE' if insensitive else ''
+        return f'{expression} {_COMPARISONS[operator]} ?{collate}', [value]
+    return None
+
+def filter_query_to_sql(filter_query):
+    """Return (' WHERE ...' or '', params) for a DataTable filter_query.
+
+    Clauses that reference unknown columns or operators are ignored, the
+    same way the native table filter ignores what it cannot parse."""
+    clauses, params = [], []
+    for part in (filter_query or '').split(' && '):
+        match = _CLAUSE_RE.match(part.strip())
+        if not match:
+            continue
+        column = match.group('column')
+        if column not in DISPLAY_COLUMNS:
+            continue
+        translated = _clause(DISPLAY_COLUMNS[column], column,
+                             match.group('operator'), _unquote(match.group('value')))
+        if translated:
+            clauses.append(translated[0])
+            params.extend(translated[1])
+    where = ' WHERE ' + ' AND '.join(clauses) if clauses else ''
+    return where, params
+
+def sort_by_to_sql(sort_by, columns=DISPLAY_COLUMNS, tiebreak='id'):
+    """ORDER BY expression for a DataTable sort_by list (ties broken by `tiebreak`).
+
+    `columns` maps the sortable column names to their SQL expressions.
+    Entries that are not {'column_id', 'direction'} dicts are ignored."""
+    terms = []
+    for item in sort_by if isinstance(sort_by, list) else []:
+        column = item.get('column_id') if isinstance(item, dict) else None
+        if isinstance(column, str) and column in columns:
+            direction = 'DESC' if item.get('direction') == 'desc' else 'ASC'
+            terms.append(f'{columns[column]} {direction}')
+    terms.append(tiebreak)
+    return ', '.join(terms)
@@ -0,0 +1,79 @@
+"""Year-end spend projections per cost center.
+
+Monthly Consumed totals for every cost center are loaded from daily_summary
+into one (cost centers x months) matrix, and each projection method is a
+handful of NumPy operations over the whole matrix:
+
+linear    extends each cost center's average monthly burn so far.
+seasonal  extends a trailing moving average, shaped month by month by the
+          same months of the previous year where that history exists.
+
+"Elapsed" months are those up to and including the month of `as_of`.
+"""
+import numpy as np
+
+from utils.cache import aggregate_cache, cached_by_data_version
+from utils.db import get_monthly_cost_center_sums
+from utils.periods import add_months, month_keys
+
+MOVING_AVERAGE_MONTHS = 3
+
+def monthly_matrix(rows, centers, keys):
+    """len(centers) x len(keys) array of totals from (center, month, total) rows."""
+    matrix = np.zeros((len(centers), len(keys)))
+    if rows:
+        row_centers, row_months, totals = (np.asarray(column) for column in zip(*rows))
+        inside = np.isin(row_months, keys)
+        np.add.at(matrix,
+                  (np.searchsorted(centers, row_centers[inside]), np.searchsorted(keys, row_months[inside])),
+                  totals[inside].astype(np.float64))
+    return matrix
+
+def linear_projection(actual, elapsed):
+    """Spend per remaining month at each cost center's average burn over the elapsed months."""
+    burn = actual[:, :elapsed].sum(axis=1) / elapsed if elapsed else np.zeros(len(actual))
+    return np.repeat(burn[:, None], actual.shape[1] - elapsed, axis=1)
+
+def seasonal_projection(actual, history, elapsed, window=MOVING_AVERAGE_MONTHS):
+    """Spend per remaining month: the trailing `window`-month average, scaled by how
+    last year's spend in that month compared with last year's same trailing window.
+
+    `history` holds the previous year's totals for the same months as `actual`;
+    cost centers without last-year spend in the window fall back to the plain
+    moving average."""
+    window = min(window, elapsed)
+    if not window:
+        return np.zeros((len(actual), actual.shape[1] - elapsed))
+    level = actual[:, elapsed - window:elapsed].mean(axis=1)
+    base = history[:, elapsed - window:elapsed].mean(axis=1)
+    future = history[:, elapsed:]
+    factors = np.divide(future, base[:, None], out=np.ones_like(future), where=base[:, None] > 0)
+    return level[:, None] * factors
+
+@cached_by_data_version(aggregate_cache)
+def forecast_year_end(start, end, as_of):
+    """Projected Consumed at `end` per cost center, as of the date `as_of`.
+
+    Returns a dict of parallel lists: centers, budget, consumed (to date),
+    linear and seasonal (projected totals at `end`)."""
+    keys = np.array(month_keys(start, end))
+    history_start = add_months(start, -12)
+    consumed_rows = get_monthly_cost_center_sums('Consumed', history_start, end)
+    budget_rows = get_monthly_cost_center_sums('Budget', start, end)
+    centers = np.array(sorted({row[0] for row in consumed_rows} | {row[0] for row in budget_rows}), dtype=object)
+
+    # The previous year's matrix lines up month for month with this one
+    all_keys = np.array(month_keys(history_start, end))
+    consumed = monthly_matrix(consumed_rows, centers, all_keys)
+    history, actual = consumed[:, :len(keys)], consumed[:, -len(keys):]
+    budget = monthly_matrix(budget_rows, centers, keys).sum(axis=1)
+
+    elapsed = int(np.searchsorted(keys, f'{as_of:%Y-%m}', side='right'))
+    to_date = actual[:, :elapsed].sum(axis=1)
+    return {
+        'centers': centers.tolist(),
+        'budget': budget.tolist(),
+        'consumed': to_date.tolist(),
+        'linear': (to_date + linear_projection(actual, elapsed).sum(axis=1)).tolist(),
+        'seasonal': (to_date + seasonal_projection(actual, history, elapsed).sum(axis=1)).tolist(),
+    }
@@ -0,0 +1,155 @@
+"""Bulk import of SAP/ERP transaction exports (CSV or Parquet).
+
+Files are read in chunks, each row is validated against the same fields as
+the transaction form, and valid rows are inserted with executemany inside a
+single transaction, so a failed import leaves the ledger untouched.
+
+    python -m utils.importer export.csv [--chunk-size 5000]
+"""
+import argparse
+import csv
+import io
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+from utils.db import CATEGORIES, TYPES, add_transactions, init_db, to_cents
+
+CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 100
+
+FIELDS = ['date', 'cost_center_project', 'cost_center_sow', 'sow_number',
+          'po', 'amount', 'category', 'type']
+
+# Accept the database column names as well as the headers used by the CSV
+# export and the transaction form labels.
+HEADER_ALIASES = {
+    'date': 'date', 'transaction date': 'date',
+    'cost center project': 'cost_center_project',
+    'cost center sow': 'cost_center_sow',
+    'sow number': 'sow_number', 'sow': 'sow_number',
+    'po': 'po', 'po number': 'po',
+    'amount': 'amount', 'amount ($)': 'amount',
+    'category': 'category',
+    'type': 'type',
+}
+
+def canonical_header(name):
+    key = str(name).strip()
+    return HEADER_ALIASES.get(key.lower(), key)
+
+def validate_row(row):
+    """Return (row tuple ready for insert, None) or (None, rejection reason)."""
+    values = {field: row.get(field) for field in FIELDS}
+    for field, value in values.items():
+        if isinstance(value, str):
+            values[field] = value = value.strip()
+        if value is None or value == '':
+            return None, f'missing {field}'
+    try:
+        iso_date = date.fromisoformat(str(values['date'])[:10]).isoformat()
+    except ValueError:
+        return None, f"invalid date {values['date']!r}"
+    try:
+        cents = to_cents(values['amount'])
+    except (ArithmeticError, ValueError):
+        return None, f"invalid amount {values['amount']!r}"
+    if cents < 0:
+        return None, f"negative amount {values['amount']!r}"
+    if values['category'] not in CATEGORIES:
+        return None, f"unknown category {values['category']!r}"
+    if values['type'] not in TYPES:
+        return None, f"unknown type {values['type']!r}"
+    return (iso_date, str(values['cost_center_project']), str(values['cost_center_sow']),
+            str(values['sow_number']), str(values['po']), cents,
+            values['category'], values['type']), None
+
+def _csv_chunks(stream, chunk_size):
+    reader = csv.DictReader(stream)
+    if reader.fieldnames:
+        reader.fieldnames = [canonical_header(name) for name in reader.fieldnames]
+    chunk = []
+    for row in reader:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _parquet_chunks(source, chunk_size):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise Exception('Parquet import requires pyarrow (pip install pyarrow)')
+    parquet_file = pq.ParquetFile(source)
+    names = [canonical_header(name) for name in parquet_file.schema_arrow.names]
+    for batch in parquet_file.iter_batches(batch_size=chunk_size):
+        yield batch.rename_columns(names).to_pylist()
+
+def read_chunks(source, fmt=None, chunk_size=CHUNK_SIZE):
+    """Yield lists of row dicts from a path or binary file object."""
+    if fmt is None:
+        fmt = Path(getattr(source, 'name', str(source))).suffix.lstrip('.').lower() or 'csv'
+    if fmt == 'parquet':
+        yield from _parquet_chunks(source, chunk_size)
+    elif fmt == 'csv':
+        if isinstance(source, (str, Path)):
+            with open(source, newline='', encoding='utf-8-sig') as stream:
+                yield from _csv_chunks(stream, chunk_size)
+        else:
+            yield from _csv_chunks(io.TextIOWrapper(source, encoding='utf-8-sig', newline=''), chunk_size)
+    else:
+        raise Exception(f'Unsupported import format: {fmt}')
+
+def import_transactions(source, fmt=None, chunk_size=CHUNK_SIZE):
+    """Import a CSV/Parquet file and return a report dict with inserted and
+    rejected counts, the first rejection reasons and the throughput."""
+    report = {'inserted': 0, 'rejected': 0, 'errors': [], 'seconds': 0.0, 'rows_per_sec': 0.0}
+    started = time.perf_counter()
+
+    def valid_batches():
+        row_number = 0
+        for chunk in read_chunks(source, fmt, chunk_size):
+            batch = []
+            for row in chunk:
+                row_number += 1
+                values, error = validate_row(row)
+                if error:
+                    report['rejected'] += 1
+                    if len(report['errors']) < MAX_REPORTED_ERRORS:
+                        report['errors'].append((row_number, error))
+                else:
+                    batch.append(values)
+            if batch:
+                yield batch
+
+    report['inserted'] = add_transactions(valid_batches())
+    report['seconds'] = time.perf_counter() - started
+    processed = report['inserted'] + report['rejected']
+    report['rows_per_sec'] = processed / report['seconds'] if report['seconds'] else 0.0
+    return report
+
+def format_report(report):
+    return (f"Imported {report['inserted']:,} rows, rejected {report['rejected']:,} "
+            f"in {report['seconds']:.2f}s ({report['rows_per_sec']:,.0f} rows/sec)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Bulk import transactions from CSV or Parquet.')
+    parser.add_argument('path', help='CSV or Parquet file to import')
+    parser.add_argument('--format', choices=['csv', 'parquet'], help='override detection by file extension')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    init_db()
+    report = import_transactions(args.path, args.format, args.chunk_size)
+    print(format_report(report))
+    for row_number, error in report['errors']:
+        print(f'  row {row_number}: {error}', file=sys.stderr)
+    if report['rejected'] > len(report['errors']):
+        print(f"  ... and {report['rejected'] - len(report['errors'])} more", file=sys.stderr)
+    return 0 if report['inserted'] or not report['rejected'] else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
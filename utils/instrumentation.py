@@ -0,0 +1,187 @@
+"""Timing instrumentation for Dash callbacks, Flask routes and database queries.
+
+install(app) hooks the Flask server behind a Dash app and registers a
+utils.db query observer:
+
+- every /_dash-update-component request is recorded under the name of the
+  callback function it ran, with wall time and response bytes;
+- other non-asset routes (e.g. the CSV export) are recorded by URL rule,
+  timed until a streamed body has been fully sent;
+- every observed utils.db query is recorded with wall time and row count.
+
+Events go into a bounded ring buffer for the admin metrics page, and into
+running per-name totals served in Prometheus text format at METRICS_PATH,
+alongside the cache, cache warmer, ledger snapshot and connection counters.
+Keep that path on an internal network; it carries no secrets but is not
+behind the login.
+"""
+import threading
+import time
+from collections import deque
+
+from utils import db, ledger, worker
+from utils.cache import aggregate_cache, figure_cache
+
+RING_SIZE = 2000
+METRICS_PATH = '/metrics'
+CALLBACK_PATH = '/_dash-update-component'
+# Framework assets, not worth a record each
+SKIPPED_PREFIXES = ('/_dash-component-suites/', '/_dash-layout', '/_dash-dependencies', '/_favicon', '/assets/')
+CACHES = (('aggregate', aggregate_cache), ('figure', figure_cache))
+
+class Recorder:
+    """Thread-safe ring buffer of recent events plus running totals per (kind, name)."""
+
+    def __init__(self, size=RING_SIZE):
+        self.events = deque(maxlen=size)
+        self.totals = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind, name, seconds, rows=None, nbytes=None):
+        event = {'at': time.time(), 'kind': kind, 'name': name, 'seconds': seconds, 'rows': rows, 'bytes': nbytes}
+        with self._lock:
+            self.events.append(event)
+            total = self.totals.setdefault((kind, name), {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0,
+                                                          'rows': 0, 'bytes': 0})
+            total['count'] += 1
+            total['seconds'] += seconds
+            total['max_seconds'] = max(total['max_seconds'], seconds)
+            total['rows'] += rows or 0
+            total['bytes'] += nbytes or 0
+
+    def recent(self, limit=None):
+        """Newest events first."""
+        with self._lock:
+            events = list(self.events)
+        events.reverse()
+        return events[:limit] if limit else events
+
+    def snapshot(self):
+        """Copy of the running totals, keyed by (kind, name)."""
+        with self._lock:
+            return {key: dict(value) for key, value in self.totals.items()}
+
+    def summary(self):
+        """One dict per (kind, name), slowest total first; p95 is over the ring buffer."""
+        with self._lock:
+            totals = {key: dict(value) for key, value in self.totals.items()}
+            events = list(self.events)
+        recent = {}
+        for event in events:
+            recent.setdefault((event['kind'], event['name']), []).append(event['seconds'])
+        rows = []
+        for (kind, name), total in totals.items():
+            timings = sorted(recent.get((kind, name), []))
+            p95 = timings[min(len(timings) - 1, int(0.95 * len(timings)))] if timings else 0.0
+            rows.append({'kind': kind, 'name': name, 'count': total['count'],
+                         'total_ms': 1000 * total['seconds'],
+                         'avg_ms': 1000 * total['seconds'] / total['count'],
+                         'p95_ms': 1000 * p95, 'max_ms': 1000 * total['max_seconds'],
+                         'rows': total['rows'], 'bytes': total['bytes']})
+        rows.sort(key=lambda row: row['total_ms'], reverse=True)
+        return rows
+
+    def clear(self):
+        with self._lock:
+            self.events.clear()
+            self.totals.clear()
+
+recorder = Recorder()
+
+# --- Prometheus text format ---
+_METRICS = [
+    # (metric, kind, label, total field, help)
+    ('teampower_callback_seconds', 'callback', 'callback', 'seconds', 'Dash callback wall time'),
+    ('teampower_callback_response_bytes', 'callback', 'callback', 'bytes', 'Dash callback response size'),
+    ('teampower_route_seconds', 'route', 'rule', 'seconds', 'Flask route wall time, until the body is sent'),
+    ('teampower_route_response_bytes', 'route', 'rule', 'bytes', 'Flask route response size'),
+    ('teampower_query_seconds', 'query', 'query', 'seconds', 'utils.db query wall time'),
+    ('teampower_query_rows', 'query', 'query', 'rows', 'Rows returned by utils.db queries'),
+]
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def prometheus_text():
+    """Running totals as Prometheus text exposition (summaries without quantiles)."""
+    totals = recorder.snapshot()
+    lines = []
+    for metric, kind, label, field, help_text in _METRICS:
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} summary')
+        for (event_kind, name), total in sorted(totals.items()):
+            if event_kind == kind:
+                lines.append(f'{metric}_count{{{label}="{_label(name)}"}} {total["count"]}')
+                lines.append(f'{metric}_sum{{{label}="{_label(name)}"}} {total[field]}')
+    for name, cache in CACHES:
+        stats = cache.stats()
+        label = f'{{cache="{name}"}}'
+        for field in ('hits', 'misses', 'evictions'):
+            lines.append(f'teampower_cache_{field}_total{label} {stats[field]}')
+        lines.append(f'teampower_cache_entries{label} {stats["size"]}')
+        lines.append(f'teampower_cache_bytes{label} {stats["bytes"]}')
+        # Time spent computing values on a miss
+        lines.append(f'teampower_cache_build_seconds_count{label} {stats["builds"]}')
+        lines.append(f'teampower_cache_build_seconds_sum{label} {stats["build_seconds"]}')
+        lines.append(f'teampower_cache_last_build_seconds{label} {stats["last_build_ms"] / 1000}')
+    warmer = worker.worker_stats()
+    lines.append(f'teampower_cache_warm_runs_total {warmer["runs"]}')
+    lines.append(f'teampower_cache_warm_errors_total {warmer["errors"]}')
+    lines.append(f'teampower_cache_warm_last_seconds {warmer["last_ms"] / 1000}')
+    lines.append(f'teampower_cache_warmer_running {int(warmer["running"])}')
+    # How get_ledger() refreshed: reloaded in full, appended new rows, or found another thread's refresh
+    refreshes = ledger.ledger_stats()
+    for kind in ('full', 'delta', 'current'):
+        lines.append(f'teampower_ledger_refreshes_total{{kind="{kind}"}} {refreshes[kind]}')
+    connections = db.connection_stats()
+    for field in ('opened', 'reused', 'reconnected', 'closed'):
+        lines.append(f'teampower_db_connections_{field}_total {connections[field]}')
+    lines.append(f'teampower_db_connection_reuse_ratio {connections["reuse_ratio"]}')
+    return '\n'.join(lines) + '\n'
+
+# --- Hooks ---
+def _callback_name(app, body):
+    output = (body or {}).get('output', '')
+    func = app.callback_map.get(output, {}).get('callback')
+    return getattr(func, '__name__', output)
+
+def _count_bytes(chunks, counter):
+    for chunk in chunks:
+        counter[0] += len(chunk)
+        yield chunk
+
+def install(app, metrics_path=METRICS_PATH):
+    """Start recording `app`'s callbacks, routes and database queries, and serve
+    Prometheus metrics at `metrics_path`."""
+    from flask import Response, g, request
+
+    server = app.server
+    db.QUERY_OBSERVERS.append(lambda name, seconds, rows: recorder.record('query', name, seconds, rows=rows))
+
+    @server.before_request
+    def start_timer():
+        if not request.path.startswith(SKIPPED_PREFIXES):
+            g.instrument_started = time.perf_counter()
+
+    @server.after_request
+    def record_request(response):
+        started = g.pop('instrument_started', None)
+        if started is None or request.url_rule is None:
+            return response
+        if request.path == CALLBACK_PATH:
+            kind, name = 'callback', _callback_name(app, request.get_json(silent=True))
+        else:
+            # The rule, not the path, so arbitrary URLs cannot grow the totals
+            kind, name = 'route', request.url_rule.rule
+        if response.is_streamed:
+            # The body is produced after this hook returns; record once it is sent
+            sent = [0]
+            response.response = _count_bytes(response.response, sent)
+            response.call_on_close(lambda: recorder.record(kind, name, time.perf_counter() - started, nbytes=sent[0]))
+        else:
+            recorder.record(kind, name, time.perf_counter() - started, nbytes=response.calculate_content_length())
+        return response
+
+    @server.route(metrics_path)
+    def prometheus_metrics():
+        return Response(prometheus_text(), mimetype='text/plain; version=0.0.4')
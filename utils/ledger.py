@@ -0,0 +1,78 @@
+"""Process-wide, read-only snapshot of the ledger as a typed DataFrame.
+
+Every caller of get_ledger() shares one LedgerSnapshot. When the database
+data version moves on, the next call builds a new snapshot and swaps it in
+with a single assignment; readers holding the old one keep a consistent
+view. If the only change since the last snapshot is new rows (ids above its
+watermark), just those rows are fetched and appended. Any UPDATE or DELETE
+moves the data version and also the edit version that triggers keep in the
+database (see utils.db.get_edit_version), and then the snapshot is reloaded
+in full.
+"""
+import threading
+from collections import namedtuple
+
+from utils import db
+from utils.db import (get_data_version, get_edit_version, get_transactions_df, read_transaction,
+                      DISPLAY_COLUMNS)
+
+SNAPSHOT_COLUMNS = ['id', *DISPLAY_COLUMNS]
+
+# frame is shared: treat it as read-only (pandas copy-on-write keeps derived
+# frames from writing through). watermark is the highest id it holds, and
+# path the database file it was read from.
+LedgerSnapshot = namedtuple('LedgerSnapshot', 'frame data_version edit_version watermark path')
+
+_snapshot = None
+_refresh_lock = threading.Lock()
+_stats = {'full': 0, 'delta': 0, 'current': 0}
+
+def _concat(frame, delta):
+    """Append delta to frame, keeping categorical columns categorical."""
+    import pandas as pd
+    from pandas.api.types import union_categoricals
+    if frame.empty:
+        return delta
+    if delta.empty:
+        return frame
+    return pd.DataFrame({
+        column: (union_categoricals([frame[column], delta[column]]) if isinstance(frame[column].dtype, pd.CategoricalDtype)
+                 else pd.concat([frame[column], delta[column]], ignore_index=True))
+        for column in frame.columns
+    })
+
+def _load(previous):
+    """Build the snapshot for the current data version, from `previous` if it can be extended."""
+    if previous is not None and previous.path != db.DB_PATH:
+        # Versions are per database file, so nothing carries over to another one
+        previous = None
+    with read_transaction():
+        version = get_data_version()
+        if previous is not None and previous.data_version == version:
+            _stats['current'] += 1
+            return previous
+        edit_version = get_edit_version()
+        if previous is not None and previous.edit_version == edit_version:
+            delta = get_transactions_df(SNAPSHOT_COLUMNS, ' WHERE id > ?', (previous.watermark,))
+            frame = _concat(previous.frame, delta)
+            _stats['delta'] += 1
+        else:
+            frame = get_transactions_df(SNAPSHOT_COLUMNS)
+            _stats['full'] += 1
+        watermark = int(frame['id'].max()) if len(frame) else 0
+    return LedgerSnapshot(frame, version, edit_version, watermark, db.DB_PATH)
+
+def get_ledger():
+    """The current LedgerSnapshot, refreshed first if the database has changed."""
+    global _snapshot
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.path == db.DB_PATH and snapshot.data_version == get_data_version():
+        return snapshot
+    # One refresher at a time; others wait and then reuse its result
+    with _refresh_lock:
+        _snapshot = _load(_snapshot)
+        return _snapshot
+
+def ledger_stats():
+    """How often get_ledger() reloaded in full, appended a delta, or found another thread's refresh."""
+    return dict(_stats)
@@ -0,0 +1,91 @@
+"""Reporting periods for the dashboard: fiscal years, fiscal quarters and a
+rolling twelve-month window, resolved to inclusive (start, end) dates that
+the aggregation queries filter on.
+"""
+from datetime import date, timedelta
+
+# First calendar month of the fiscal year (1 = January). Fiscal years are
+# named after the calendar year they end in, so with an April start FY2026
+# runs from 2025-04-01 to 2026-03-31.
+FISCAL_YEAR_START_MONTH = 1
+
+PERIOD_KINDS = [
+    {'label': 'Fiscal year', 'value': 'fiscal_year'},
+    {'label': 'Quarter', 'value': 'quarter'},
+    {'label': 'Rolling 12 months', 'value': 'rolling_12'},
+]
+
+MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+def add_months(day, months):
+    """First day of the month `months` after the month of `day`."""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def fiscal_year_of(day):
+    if FISCAL_YEAR_START_MONTH == 1 or day.month < FISCAL_YEAR_START_MONTH:
+        return day.year
+    return day.year + 1
+
+def fiscal_quarter_of(day):
+    return (day.month - FISCAL_YEAR_START_MONTH) % 12 // 3 + 1
+
+def fiscal_year_start(fiscal_year):
+    if FISCAL_YEAR_START_MONTH == 1:
+        return date(fiscal_year, 1, 1)
+    return date(fiscal_year - 1, FISCAL_YEAR_START_MONTH, 1)
+
+def resolve_period(kind='fiscal_year', fiscal_year=None, quarter=None, today=None):
+    """Return (start, end, label) for a period selection; both dates inclusive."""
+    today = today or date.today()
+    fiscal_year = int(fiscal_year or fiscal_year_of(today))
+    if kind == 'rolling_12':
+        start = add_months(today, -11)
+        end = add_months(today, 1) - timedelta(days=1)
+        return start, end, f'Rolling 12 months to {end:%b %Y}'
+    if kind == 'quarter':
+        quarter = int(quarter or 1)
+        start = add_months(fiscal_year_start(fiscal_year), 3 * (quarter - 1))
+        end = add_months(start, 3) - timedelta(days=1)
+        return start, end, f'FY{fiscal_year} Q{quarter}'
+    start = fiscal_year_start(fiscal_year)
+    end = add_months(start, 12) - timedelta(days=1)
+    return start, end, f'FY{fiscal_year}'
+
+def fiscal_year_options(first_day=None, last_day=None, today=None):
+    """Dropdown options covering every fiscal year with data, plus the current one."""
+    today = today or date.today()
+    years = {fiscal_year_of(today)}
+    if first_day and last_day:
+        years.update(range(fiscal_year_of(first_day), fiscal_year_of(last_day) + 1))
+    return [{'label': f'FY{year}', 'value': year} for year in sorted(years, reverse=True)]
+
+def month_keys(start, end):
+    """'YYYY-MM' keys for every month touching [start, end]."""
+    keys, month = [], date(start.year, start.month, 1)
+    while month <= end:
+        keys.append(f'{month:%Y-%m}')
+        month = add_months(month, 1)
+    return keys
+
+def month_tick_labels(keys):
+    """Month names, with the fiscal quarter marked on each quarter's first month."""
+    labels = []
+    for key in keys:
+        month = date(int(key[:4]), int(key[5:]), 1)
+        name = MONTH_NAMES[month.month - 1]
+        if (month.month - FISCAL_YEAR_START_MONTH) % 3 == 0:
+            name = f'Q{fiscal_quarter_of(month)} - {name}'
+        labels.append(name)
+    return labels
+
+def quarter_groups(keys):
+    """Split month keys into consecutive runs belonging to the same fiscal quarter."""
+    groups = []
+    for key in keys:
+        month = date(int(key[:4]), int(key[5:]), 1)
+        if groups and (month.month - FISCAL_YEAR_START_MONTH) % 3 != 0:
+            groups[-1].append(key)
+        else:
+            groups.append([key])
+    return groups
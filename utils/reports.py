@@ -0,0 +1,196 @@
+"""Monthly per cost center / SOW reports, aggregated in parallel.
+
+The ledger is split into partitions, either by cost center project (centers
+packed into bins of similar row counts) or by month (consecutive runs of
+months of similar row counts). Each partition is loaded and grouped in a
+worker process: category totals per (cost center, SOW, month) and running
+totals within the partition. The parent merges the partial results in
+partition order, adding each group's totals from earlier partitions to its
+running totals, so both partitionings give the same report.
+build_ledger_report() gives the same report from the process's shared
+ledger snapshot (utils.ledger) instead, without touching the database when
+the snapshot is current.
+
+Workers are spawned rather than forked, since the app process has threads
+(connections, the cache warmer) that fork would copy mid-flight, and each
+opens its own connection to the database file; WAL lets them read side by side.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from utils import db
+from utils.db import CATEGORIES, get_group_row_counts
+
+REPORT_WORKERS = int(os.environ.get('TEAMPOWER_REPORT_WORKERS') or os.cpu_count() or 1)
+PARTITIONS_PER_WORKER = 2  # smaller pieces even out uneven partitions
+PARTITION_BY = ('cost_center', 'month')
+
+GROUP_KEYS = ['Cost Center Project', 'SOW Number']
+TO_DATE_COLUMNS = [f'{category} to Date' for category in CATEGORIES]
+REPORT_COLUMNS = [*GROUP_KEYS, 'Month', *CATEGORIES, *TO_DATE_COLUMNS, 'Remaining']
+LOAD_COLUMNS = ['Date', *GROUP_KEYS, 'Category', 'Amount']
+
+_executor = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+# --- Partitioning ---
+def _date_clauses(start, end):
+    clauses, params = [], []
+    if start is not None:
+        clauses.append('date >= ?')
+        params.append(start)
+    if end is not None:
+        clauses.append('date <= ?')
+        params.append(end)
+    return clauses, params
+
+def _center_bins(counts, parts):
+    """Pack cost centers into at most `parts` bins, largest first into the lightest bin."""
+    bins = [[] for _ in range(min(parts, len(counts)))]
+    loads = [0] * len(bins)
+    for center, rows in sorted(counts, key=lambda item: -item[1]):
+        lightest = loads.index(min(loads))
+        bins[lightest].append(center)
+        loads[lightest] += rows
+    return bins
+
+def _month_runs(counts, parts):
+    """Split months (in order) into at most `parts` consecutive runs of similar row counts."""
+    total = sum(rows for _, rows in counts)
+    runs, run, seen = [], [], 0
+    for month, rows in counts:
+        run.append(month)
+        seen += rows
+        if seen >= total * (len(runs) + 1) / parts and len(runs) < parts - 1:
+            runs.append(run)
+            run = []
+    if run:
+        runs.append(run)
+    return runs
+
+def plan_partitions(by, parts, start=None, end=None):
+    """(where, params) filters splitting the transactions in [start, end] into at
+    most `parts` partitions; month partitions are returned in date order."""
+    if by not in PARTITION_BY:
+        raise ValueError(f"Unknown partitioning: {by!r}")
+    start, end = (f'{day:%Y-%m-%d}' if hasattr(day, 'strftime') else day for day in (start, end))
+    counts = get_group_row_counts(by, start, end)
+    date_clauses, date_params = _date_clauses(start, end)
+    partitions = []
+    if by == 'cost_center':
+        for centers in _center_bins(counts, parts):
+            named = [center for center in centers if center]
+            options = [f"cost_center_project IN ({', '.join('?' * len(named))})"] if named else []
+            if len(named) < len(centers):
+                # daily_summary stores a NULL cost center as ''
+                options.append("cost_center_project IS NULL OR cost_center_project = ''")
+            clauses = [f"({' OR '.join(options)})", *date_clauses]
+            partitions.append((' WHERE ' + ' AND '.join(clauses), [*named, *date_params]))
+    else:
+        for months in _month_runs(counts, parts):
+            # ISO dates compare as text, so day '31' bounds every day of the last month
+            clauses = ['date >= ?', 'date <= ?', *date_clauses]
+            partitions.append((' WHERE ' + ' AND '.join(clauses), [f'{months[0]}-01', f'{months[-1]}-31', *date_params]))
+    return partitions
+
+# --- Aggregation ---
+def aggregate_frame(frame):
+    """Category totals and running totals per (cost center, SOW, month) for the
+    transactions in `frame` (read only), as a flat DataFrame ordered by group and month."""
+    month = frame['Date'].dt.to_period('M').rename('Month')
+    monthly = (frame.groupby([*GROUP_KEYS, month, 'Category'], observed=True, dropna=False)['Amount'].sum()
+               .unstack('Category', fill_value=0.0)
+               .reindex(columns=CATEGORIES, fill_value=0.0))
+    monthly.columns = list(CATEGORIES)
+    to_date = monthly.groupby(level=GROUP_KEYS, observed=True, dropna=False).cumsum()
+    monthly[TO_DATE_COLUMNS] = to_date.to_numpy()
+    partial = monthly.reset_index()
+    for column in GROUP_KEYS:
+        partial[column] = partial[column].astype(object).fillna('')
+    partial['Month'] = partial['Month'].astype(str)
+    return partial
+
+def aggregate_partition(where='', params=()):
+    """aggregate_frame() over the transactions matching `where`, loaded from SQLite."""
+    return aggregate_frame(db.get_transactions_df(LOAD_COLUMNS, where, params))
+
+def aggregate_ledger(start=None, end=None):
+    """aggregate_frame() over the transactions in [start, end], from the ledger snapshot."""
+    import pandas as pd
+    from utils.ledger import get_ledger
+    frame = get_ledger().frame
+    if start is not None:
+        frame = frame[frame['Date'] >= pd.Timestamp(start)]
+    if end is not None:
+        frame = frame[frame['Date'] <= pd.Timestamp(end)]
+    return aggregate_frame(frame[LOAD_COLUMNS])
+
+def _aggregate_in_worker(db_path, where, params):
+    db.DB_PATH = Path(db_path)
+    return aggregate_partition(where, params)
+
+def merge_partials(partials):
+    """Combine partial reports given in partition order into one report."""
+    import pandas as pd
+    carry = None
+    merged = []
+    for partial in partials:
+        if partial.empty:
+            continue
+        if carry is not None:
+            # Totals a group reached in earlier partitions carry into its running totals
+            offset = carry.reindex(pd.MultiIndex.from_frame(partial[GROUP_KEYS])).fillna(0.0)
+            partial[TO_DATE_COLUMNS] += offset.to_numpy()
+        sums = partial.groupby(GROUP_KEYS)[CATEGORIES].sum()
+        carry = sums if carry is None else carry.add(sums, fill_value=0.0)
+        merged.append(partial)
+    if not merged:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+    report = pd.concat(merged, ignore_index=True).sort_values([*GROUP_KEYS, 'Month'], ignore_index=True)
+    report['Remaining'] = report['Budget to Date'] - report['Consumed to Date']
+    return report[REPORT_COLUMNS]
+
+# --- Process pool ---
+def _get_executor(workers):
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is not None and _executor_workers != workers:
+            _executor.shutdown()
+            _executor = None
+        if _executor is None:
+            _executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+            _executor_workers = workers
+        return _executor
+
+def shutdown_pool():
+    """Stop the worker processes; the next parallel report starts new ones."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
+
+def build_report(by='cost_center', start=None, end=None, workers=None):
+    """Monthly report per cost center and SOW over [start, end].
+
+    Columns are REPORT_COLUMNS: each category's total for the month, its
+    running total across the report, and Remaining (Budget less Consumed to
+    date). With one worker everything runs in this process."""
+    workers = workers or REPORT_WORKERS
+    if workers == 1:
+        partials = [aggregate_partition(where, params) for where, params in plan_partitions(by, 1, start, end)]
+    else:
+        partitions = plan_partitions(by, workers * PARTITIONS_PER_WORKER, start, end)
+        executor = _get_executor(workers)
+        futures = [executor.submit(_aggregate_in_worker, str(db.DB_PATH), where, params)
+                   for where, params in partitions]
+        partials = [future.result() for future in futures]
+    return merge_partials(partials)
+
+def build_ledger_report(start=None, end=None):
+    """build_report() over [start, end] from the ledger snapshot, in this process."""
+    return merge_partials([aggregate_ledger(start, end)])
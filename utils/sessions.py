@@ -0,0 +1,53 @@
+"""Login sessions stored in SQLite.
+
+The browser only holds an opaque random token (in a dcc.Store); the server
+keeps its SHA-256 hash and the username. Every callback resolves the user
+from the token it is given, so no login state lives in the process and any
+worker can serve any request.
+"""
+import hashlib
+import secrets
+import sqlite3
+import time
+
+from utils.db import get_connection
+
+SESSION_TTL = 8 * 60 * 60  # seconds
+
+def _hash(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def create_session(username):
+    """Start a session for `username` and return the token to hand to the browser."""
+    token = secrets.token_urlsafe(32)
+    now = time.time()
+    try:
+        conn = get_connection()
+        with conn:
+            conn.execute('DELETE FROM sessions WHERE expires_at < ?', (now,))
+            conn.execute('INSERT INTO sessions (token_hash, username, created_at, expires_at) VALUES (?, ?, ?, ?)',
+                         (_hash(token), username, now, now + SESSION_TTL))
+    except sqlite3.Error as e:
+        raise Exception(f"Database error: {e}")
+    return token
+
+def get_session_user(token):
+    """Username for a live session token, or None."""
+    if not token:
+        return None
+    try:
+        row = get_connection().execute('SELECT username FROM sessions WHERE token_hash = ? AND expires_at >= ?',
+                                       (_hash(token), time.time())).fetchone()
+    except sqlite3.Error as e:
+        raise Exception(f"Database error: {e}")
+    return row[0] if row else None
+
+def delete_session(token):
+    if not token:
+        return
+    try:
+        conn = get_connection()
+        with conn:
+            conn.execute('DELETE FROM sessions WHERE token_hash = ?', (_hash(token),))
+    except sqlite3.Error as e:
+        raise Exception(f"Database error: {e}")
@@ -1,4 +1,76 @@
-USERS = {
-    'admin': {'password': 'admin123', 'role': 'admin'},
-    'user1': {'password': 'user123', 'role': 'user'},
-}
+"""User accounts and roles stored in SQLite.
+
+Like the login sessions, accounts live in the database rather than in the
+process, so a password or role change made through one worker applies to
+every worker. Passwords are kept as salted PBKDF2 hashes.
+"""
+import hashlib
+import hmac
+import secrets
+import sqlite3
+
+from utils.db import get_connection
+
+ROLES = ('user', 'admin')
+PBKDF2_ITERATIONS = 600_000
+
+def hash_password(password, salt=None, iterations=PBKDF2_ITERATIONS):
+    """'pbkdf2_sha256$iterations$salt$hash' for `password`, with a random salt by default."""
+    salt = salt or secrets.token_hex(16)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode(), bytes.fromhex(salt), iterations).hex()
+    return f'pbkdf2_sha256${iterations}${salt}${digest}'
+
+def verify_password(password, stored):
+    try:
+        _, iterations, salt, _ = stored.split('$')
+        expected = hash_password(password, salt, int(iterations))
+    except ValueError:
+        return False
+    return hmac.compare_digest(expected, stored)
+
+def get_user(username):
+    """{'username', 'role'} for an account, or None."""
+    if not username:
+        return None
+    try:
+        row = get_connection().execute('SELECT username, role FROM users WHERE username = ?',
+                                       (username,)).fetchone()
+    except sqlite3.Error as e:
+        raise Exception(f"Database error: {e}")
+    return {'username': row[0], 'role': row[1]} if row else None
+
+def list_users():
+    try:
+        rows = get_connection().execute('SELECT username, role FROM users ORDER BY username').fetchall()
+    except sqlite3.Error as e:
+        raise Exception(f"Database error: {e}")
+    return [{'username': username, 'role': role} for username, role in rows]
+
+def authenticate(username, password):
+    """True if `password` is the account's current password."""
+    if not username or not password:
+        return False
+    try:
+        row = get_connection().execute('SELECT password_hash FROM users WHERE username = ?',
+                                       (username,)).fetchone()
+    except sqlite3.Error as e:
+        raise Exception(f"Database error: {e}")
+    return bool(row) and verify_password(password, row[0])
+
+def _update(sql, params):
+    try:
+        conn = get_connection()
+        with conn:
+            return conn.execute(sql, params).rowcount > 0
+    except sqlite3.Error as e:
+        raise Exception(f"Database error: {e}")
+
+def set_role(username, role):
+    """Change an account's role; False if there is no such account."""
+    if role not in ROLES:
+        raise ValueError(f"Unknown role: {role!r}")
+    return _update('UPDATE users SET role = ? WHERE username = ?', (role, username))
+
+def set_password(username, password):
+    """Change an account's password; False if there is no such account."""
+    return _update('UPDATE users SET password_hash = ? WHERE username = ?', (hash_password(password), username))
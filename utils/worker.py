@@ -0,0 +1,125 @@
+"""Background work kept off the request path.
+
+Cache warming: one daemon thread per process checks the data version every
+WARM_INTERVAL seconds, or at once after notify_write(), and when it has moved
+recomputes the dashboard aggregates, figures and forecast for the periods
+dashboards recently showed. The next page view then finds them in the
+caches instead of running pandas inside the request. Writes made by other
+processes are picked up too, since the data version lives in the database.
+
+Background callbacks: with diskcache, multiprocess and psutil installed (all
+pulled in by dash[diskcache] in requirements.txt), background_callback()
+returns the kwargs that make a Dash callback run in a separate process
+through a DiskcacheManager, so a long import does not hold a request thread.
+Without those packages the callback runs inline, with a warning at startup.
+"""
+import os
+import tempfile
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from datetime import date
+
+from utils.db import get_data_version
+
+WARM_INTERVAL = 10  # seconds
+RECENT_PERIODS = 8
+CALLBACK_CACHE_DIR = os.environ.get('TEAMPOWER_CALLBACK_CACHE',
+                                    os.path.join(tempfile.gettempdir(), 'teampower-callbacks'))
+
+_recent_periods = OrderedDict()  # (start, end) -> None, most recently shown last
+_lock = threading.Lock()
+_wake = threading.Event()
+_thread = None
+_stats = {'runs': 0, 'errors': 0, 'last_version': None, 'last_ms': 0.0}
+
+def remember_period(start, end):
+    """Record that a dashboard showed [start, end], so it is kept warm."""
+    with _lock:
+        _recent_periods[(start, end)] = None
+        _recent_periods.move_to_end((start, end))
+        while len(_recent_periods) > RECENT_PERIODS:
+            _recent_periods.popitem(last=False)
+
+def _periods():
+    from pages.dashview import default_fiscal_year
+    from utils.periods import resolve_period
+    with _lock:
+        periods = list(_recent_periods)
+    if not periods:
+        start, end, _ = resolve_period('fiscal_year', default_fiscal_year())
+        periods = [(start, end)]
+    return periods
+
+def warm():
+    """Compute the dashboard's cached values for every remembered period."""
+    from pages.dashview import dashboard_aggregates, dashboard_figures
+    from utils.forecast import forecast_year_end
+    for start, end in _periods():
+        dashboard_aggregates(start, end)
+        dashboard_figures(start, end)
+        forecast_year_end(start, end, date.today())
+
+def _run():
+    known = None
+    while True:
+        try:
+            version = get_data_version()
+            if version != known:
+                started = time.perf_counter()
+                warm()
+                known = version
+                _stats.update(runs=_stats['runs'] + 1, last_version=version,
+                              last_ms=1000 * (time.perf_counter() - started))
+        except Exception:
+            # Never let a failed refresh kill the thread; requests compute on a miss
+            _stats['errors'] += 1
+        _wake.wait(WARM_INTERVAL)
+        _wake.clear()
+
+def start():
+    """Start this process's warming thread, unless it is already running.
+
+    Threads do not survive fork(), so pre-forking servers call this in each
+    worker (see gunicorn.conf.py post_fork)."""
+    global _thread
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        # Import pandas before serving: plotly's JSON encoder uses any pandas
+        # found in sys.modules, and could meet one the thread is still importing
+        import pandas  # noqa: F401
+        _thread = threading.Thread(target=_run, name='teampower-cache-warmer', daemon=True)
+        _thread.start()
+
+def notify_write():
+    """Wake the warming thread after a write made by this process."""
+    _wake.set()
+
+def worker_stats():
+    return dict(_stats, running=_thread is not None and _thread.is_alive())
+
+# --- Background callbacks ---
+_manager = None
+
+def background_manager():
+    """A DiskcacheManager, or None when diskcache and friends are not installed."""
+    global _manager
+    if _manager is None:
+        try:
+            import diskcache
+            from dash import DiskcacheManager
+            _manager = DiskcacheManager(diskcache.Cache(CALLBACK_CACHE_DIR))
+        except ImportError:
+            warnings.warn('diskcache is not installed (pip install "dash[diskcache]"); '
+                          'background callbacks will run inline')
+            _manager = False
+    return _manager or None
+
+def background_callback(**kwargs):
+    """Keyword arguments for app.callback() that run it as a background
+    callback when a manager is available; `kwargs` (running=, progress=, ...)
+    only apply in that case."""
+    manager = background_manager()
+    return dict(background=True, manager=manager, **kwargs) if manager else {}
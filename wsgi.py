@@ -0,0 +1,41 @@
+"""Production WSGI entry point.
+
+The Flask dev server started by ``python app.py`` is single-process. In
+production, serve ``wsgi:server`` with gunicorn (``pip install gunicorn``)
+using the bundled config:
+
+    gunicorn -c gunicorn.conf.py wsgi:server
+
+Worker processes, threads per worker and the bind address come from the
+TEAMPOWER_WORKERS, TEAMPOWER_THREADS and TEAMPOWER_BIND environment
+variables (see gunicorn.conf.py). Login state lives in SQLite (see
+utils.sessions), so any worker can serve any request. uWSGI works the same
+way: ``uwsgi --http :8051 --module wsgi:server --processes 4 --threads 4``.
+
+On import, this module runs the app's startup hook (schema migrations) and
+checks that the database runs in WAL mode, so readers in utils/db.py never
+block on a writer. It also imports the heavy libraries that app.py defers,
+so with gunicorn's preload mode they load once in the master and are shared
+copy-on-write by forked workers. The cache-warming thread (utils.worker) is
+not started here, since threads do not survive fork(); gunicorn.conf.py
+starts one per worker, and under uWSGI use ``--lazy-apps`` or call
+``utils.worker.start()`` from a postfork hook.
+"""
+from app import app, startup
+from utils.db import check_wal_mode, close_connection
+
+def preload_libraries():
+    """Import the modules every worker needs before gunicorn forks."""
+    import numpy  # noqa: F401
+    import pandas  # noqa: F401
+    import plotly.express  # noqa: F401
+    import pages.dashview  # noqa: F401
+    import pages.transactions  # noqa: F401
+
+startup(background=False)
+check_wal_mode()
+preload_libraries()
+# SQLite connections must not cross fork(); workers open their own lazily
+close_connection()
+
+server = app.server